@@ -0,0 +1,77 @@
+"""create videos table
+
+Revision ID: 677087feff89
+Revises:
+Create Date: 2026-10-17 20:39:53.657734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from core.models.types import DurationType
+
+# revision identifiers, used by Alembic.
+revision: str = "677087feff89"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "videos",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("video_path", sa.Text(), nullable=False),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration", DurationType(), nullable=False),
+        sa.Column("camera_number", sa.Integer(), nullable=False),
+        sa.Column("location", sa.String(length=511), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("NEW", "TRANSCODED", "RECOGNIZED", name="videostatus"),
+            server_default="NEW",
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.CheckConstraint("length(video_path) > 0", name="video_path_not_empty"),
+        sa.CheckConstraint("camera_number > 0", name="camera_number_positive"),
+        sa.CheckConstraint("length(location) > 0", name="location_not_empty"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_videos_camera_number_start_time",
+        "videos",
+        ["camera_number", sa.literal_column("start_time DESC")],
+    )
+    op.create_index(
+        "ix_videos_status_start_time",
+        "videos",
+        ["status", sa.literal_column("start_time DESC")],
+    )
+    op.create_index(
+        "ix_videos_location_start_time",
+        "videos",
+        ["location", sa.literal_column("start_time DESC")],
+    )
+    op.create_index(
+        "ix_videos_start_time", "videos", [sa.literal_column("start_time DESC")]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_videos_start_time", table_name="videos")
+    op.drop_index("ix_videos_location_start_time", table_name="videos")
+    op.drop_index("ix_videos_status_start_time", table_name="videos")
+    op.drop_index("ix_videos_camera_number_start_time", table_name="videos")
+    op.drop_table("videos")
+    sa.Enum(name="videostatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,50 @@
+"""add id to listing indexes
+
+Revision ID: 110b8aca3c0e
+Revises: 677087feff89
+Create Date: 2026-10-17 20:41:09.057407
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "110b8aca3c0e"
+down_revision: Union[str, Sequence[str], None] = "677087feff89"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LISTING_INDEXES = {
+    "ix_videos_camera_number_start_time": ["camera_number"],
+    "ix_videos_status_start_time": ["status"],
+    "ix_videos_location_start_time": ["location"],
+    "ix_videos_start_time": [],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in LISTING_INDEXES.items():
+        op.drop_index(name, table_name="videos")
+        op.create_index(
+            name,
+            "videos",
+            [
+                *columns,
+                sa.literal_column("start_time DESC"),
+                sa.literal_column("id DESC"),
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, columns in LISTING_INDEXES.items():
+        op.drop_index(name, table_name="videos")
+        op.create_index(
+            name, "videos", [*columns, sa.literal_column("start_time DESC")]
+        )
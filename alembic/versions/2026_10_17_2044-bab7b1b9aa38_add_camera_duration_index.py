@@ -0,0 +1,31 @@
+"""add camera duration index
+
+Revision ID: bab7b1b9aa38
+Revises: 110b8aca3c0e
+Create Date: 2026-10-17 20:44:55.517387
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "bab7b1b9aa38"
+down_revision: Union[str, Sequence[str], None] = "110b8aca3c0e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_videos_camera_number_duration",
+        "videos",
+        ["camera_number", "duration"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_videos_camera_number_duration", table_name="videos")
@@ -0,0 +1,43 @@
+"""add end time
+
+Revision ID: 54e498cb28a1
+Revises: bab7b1b9aa38
+Create Date: 2026-10-17 20:46:36.804822
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "54e498cb28a1"
+down_revision: Union[str, Sequence[str], None] = "bab7b1b9aa38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "videos", sa.Column("end_time", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.execute("UPDATE videos SET end_time = start_time + duration")
+    op.alter_column("videos", "end_time", nullable=False)
+
+    # btree_gist lets the GiST index combine camera_number equality with the
+    # tstzrange containment and overlap operators.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_index(
+        "ix_videos_camera_number_time_range",
+        "videos",
+        ["camera_number", sa.text("tstzrange(start_time, end_time)")],
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_videos_camera_number_time_range", table_name="videos")
+    op.drop_column("videos", "end_time")
@@ -0,0 +1,33 @@
+"""add video lease
+
+Revision ID: d354dde828a6
+Revises: 54e498cb28a1
+Create Date: 2026-10-17 20:49:08.137105
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d354dde828a6"
+down_revision: Union[str, Sequence[str], None] = "54e498cb28a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("videos", sa.Column("lease_token", sa.String(32), nullable=True))
+    op.add_column(
+        "videos",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("videos", "lease_expires_at")
+    op.drop_column("videos", "lease_token")
@@ -0,0 +1,31 @@
+"""add video version
+
+Revision ID: 4f1d124baeb0
+Revises: d354dde828a6
+Create Date: 2026-10-17 20:54:11.786728
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4f1d124baeb0"
+down_revision: Union[str, Sequence[str], None] = "d354dde828a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "videos",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("videos", "version")
@@ -0,0 +1,181 @@
+"""partition videos by start time
+
+Opt-in: converts videos into a table range-partitioned by month of start_time
+only when run with ``alembic -x partition_videos=true upgrade head``. Without
+the flag the revision is recorded but the table is left as is; to convert
+later, downgrade to the previous revision and upgrade again with the flag.
+
+Revision ID: 879397f2ba63
+Revises: 4f1d124baeb0
+Create Date: 2026-10-17 20:57:15.249994
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = "879397f2ba63"
+down_revision: Union[str, Sequence[str], None] = "4f1d124baeb0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Indexes of videos as of this revision, recreated on the partitioned table
+# (where they become partitioned indexes) and back on downgrade.
+INDEXES = (
+    "CREATE INDEX ix_videos_camera_number_start_time "
+    "ON videos (camera_number, start_time DESC, id DESC)",
+    "CREATE INDEX ix_videos_status_start_time "
+    "ON videos (status, start_time DESC, id DESC)",
+    "CREATE INDEX ix_videos_location_start_time "
+    "ON videos (location, start_time DESC, id DESC)",
+    "CREATE INDEX ix_videos_start_time ON videos (start_time DESC, id DESC)",
+    "CREATE INDEX ix_videos_camera_number_duration "
+    "ON videos (camera_number, duration)",
+    "CREATE INDEX ix_videos_camera_number_time_range "
+    "ON videos USING gist (camera_number, tstzrange(start_time, end_time))",
+)
+
+INDEX_NAMES = (
+    "ix_videos_camera_number_start_time",
+    "ix_videos_status_start_time",
+    "ix_videos_location_start_time",
+    "ix_videos_start_time",
+    "ix_videos_camera_number_duration",
+    "ix_videos_camera_number_time_range",
+)
+
+# Creates the monthly partition holding month_start, moving any of its rows
+# out of videos_default first so that ATTACH does not fail. Returns whether a
+# partition was created.
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION videos_create_partition(month_start timestamptz)
+RETURNS boolean AS $$
+DECLARE
+    lower_bound timestamptz := date_trunc('month', month_start, 'UTC');
+    upper_bound timestamptz :=
+        ((lower_bound AT TIME ZONE 'UTC') + interval '1 month') AT TIME ZONE 'UTC';
+    partition_name text :=
+        'videos_' || to_char(lower_bound AT TIME ZONE 'UTC', 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE videos INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        partition_name
+    );
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM videos_default '
+        'WHERE start_time >= %L AND start_time < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        lower_bound, upper_bound, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE videos ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, lower_bound, upper_bound
+    );
+    RETURN true;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# Makes sure partitions exist from the current month to months_ahead months
+# from now; returns how many were created.
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION videos_ensure_partitions(months_ahead integer)
+RETURNS integer AS $$
+DECLARE
+    current_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC');
+    created integer := 0;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        IF videos_create_partition(
+            (current_month + make_interval(months => i)) AT TIME ZONE 'UTC'
+        ) THEN
+            created := created + 1;
+        END IF;
+    END LOOP;
+    RETURN created;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    partition = context.get_x_argument(as_dictionary=True).get("partition_videos")
+    if partition not in ("1", "true", "yes"):
+        return
+
+    op.execute("ALTER TABLE videos RENAME TO videos_unpartitioned")
+    op.execute(
+        "ALTER TABLE videos_unpartitioned "
+        "RENAME CONSTRAINT videos_pkey TO videos_unpartitioned_pkey"
+    )
+    for name in INDEX_NAMES:
+        op.execute(f"DROP INDEX {name}")
+
+    # The partition key has to be part of the primary key; ids stay unique
+    # through the shared videos_id_seq sequence.
+    op.execute(
+        "CREATE TABLE videos "
+        "(LIKE videos_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (start_time)"
+    )
+    op.execute(
+        "ALTER TABLE videos ADD CONSTRAINT videos_pkey PRIMARY KEY (id, start_time)"
+    )
+    for statement in INDEXES:
+        op.execute(statement)
+    op.execute("CREATE TABLE videos_default PARTITION OF videos DEFAULT")
+
+    op.execute(CREATE_PARTITION_FUNCTION)
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+    op.execute(
+        "SELECT videos_create_partition(month_start) FROM ("
+        "SELECT DISTINCT date_trunc('month', start_time, 'UTC') AS month_start "
+        "FROM videos_unpartitioned) AS months"
+    )
+    op.execute(f"SELECT videos_ensure_partitions({MONTHS_AHEAD})")
+
+    op.execute("INSERT INTO videos SELECT * FROM videos_unpartitioned")
+    op.execute("ALTER SEQUENCE videos_id_seq OWNED BY videos.id")
+    op.execute("DROP TABLE videos_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_indexes = "\n    ".join(f"DROP INDEX {name};" for name in INDEX_NAMES)
+    create_indexes = "\n    ".join(f"{statement};" for statement in INDEXES)
+    # Runs in the database so that it is a no-op for unpartitioned tables,
+    # also when generating offline SQL.
+    op.execute(
+        f"""
+DO $do$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'videos'::regclass) <> 'p' THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE videos RENAME TO videos_partitioned;
+    ALTER TABLE videos_partitioned
+        RENAME CONSTRAINT videos_pkey TO videos_partitioned_pkey;
+    {drop_indexes}
+    CREATE TABLE videos
+        (LIKE videos_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS);
+    ALTER TABLE videos ADD CONSTRAINT videos_pkey PRIMARY KEY (id);
+    INSERT INTO videos SELECT * FROM videos_partitioned;
+    ALTER SEQUENCE videos_id_seq OWNED BY videos.id;
+    DROP TABLE videos_partitioned;
+    {create_indexes}
+END
+$do$;
+"""
+    )
+    op.execute("DROP FUNCTION IF EXISTS videos_ensure_partitions(integer)")
+    op.execute("DROP FUNCTION IF EXISTS videos_create_partition(timestamptz)")
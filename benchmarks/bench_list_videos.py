@@ -0,0 +1,90 @@
+"""
+Compare the list_videos read paths on an in-memory SQLite database.
+
+    PYTHONPATH=src python benchmarks/bench_list_videos.py
+
+The ORM path hydrates Video objects, validates VideoResponse models and encodes
+them the way FastAPI does for a response_model. The fast path selects plain
+column mappings and encodes them straight to JSON bytes.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic_core import to_json
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.schemas import VideoPage, VideoResponse
+from app.services import VideoService
+from core import Base
+from core.models import Video
+
+SIZES = (10_000, 100_000)
+REPEATS = 3
+
+
+async def orm_path(session, limit: int) -> bytes:
+    videos, next_cursor = await VideoService.list_videos(session, limit=limit)
+    page = VideoPage(
+        items=[VideoResponse.model_validate(video) for video in videos],
+        next_cursor=next_cursor,
+    )
+    return json.dumps(jsonable_encoder(page)).encode()
+
+
+async def fast_path(session, limit: int) -> bytes:
+    rows, next_cursor = await VideoService.list_video_rows(session, limit=limit)
+    return to_json({"items": [dict(row) for row in rows], "next_cursor": next_cursor})
+
+
+async def seed(session_factory, size: int) -> None:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "video_path": f"/videos/camera{idx % 50 + 1}/clip{idx}.mp4",
+            "start_time": start + timedelta(seconds=idx),
+            "duration": timedelta(seconds=60),
+            "end_time": start + timedelta(seconds=idx + 60),
+            "camera_number": idx % 50 + 1,
+            "location": f"Location {idx % 10}",
+        }
+        for idx in range(size)
+    ]
+    async with session_factory() as session:
+        await session.execute(insert(Video), rows)
+        await session.commit()
+
+
+async def measure(session_factory, path, size: int) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        async with session_factory() as session:
+            started = time.perf_counter()
+            await path(session, size)
+            best = min(best, time.perf_counter() - started)
+    return size / best
+
+
+async def main() -> None:
+    for size in SIZES:
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(session_factory, size)
+
+        orm = await measure(session_factory, orm_path, size)
+        fast = await measure(session_factory, fast_path, size)
+        print(
+            f"{size:>7} rows: orm {orm:>10,.0f} rows/s | "
+            f"fast {fast:>10,.0f} rows/s | x{fast / orm:.2f}"
+        )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
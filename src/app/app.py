@@ -1,9 +1,59 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.middleware import MetricsMiddleware, QueryBudgetMiddleware
 from app.routers import router as api_router
+from app.services import PartitionService, RetentionService
+from app.utils import (
+    QueryDebugger,
+    event_broker,
+    instrument_engine,
+    listen_for_events,
+)
+from core import db_helper, settings
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    tasks = []
+    if settings.events.backend == "postgres":
+        tasks.append(
+            asyncio.create_task(
+                listen_for_events(
+                    db_helper.engine, settings.events.channel, event_broker
+                )
+            )
+        )
+    if settings.partitions.manage:
+        tasks.append(
+            asyncio.create_task(
+                PartitionService.maintain_partitions(
+                    db_helper.session_factory,
+                    settings.partitions.months_ahead,
+                    settings.partitions.check_interval_s,
+                )
+            )
+        )
+    if settings.retention.enabled:
+        tasks.append(
+            asyncio.create_task(
+                RetentionService.purge_periodically(
+                    db_helper.session_factory, settings.retention
+                )
+            )
+        )
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await db_helper.dispose()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -17,4 +67,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
+for engine in (db_helper.engine, *db_helper.replica_engines):
+    instrument_engine(engine)
+
+if settings.query_debug.enabled:
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        max_queries=settings.query_debug.max_per_request,
+        repeat_threshold=settings.query_debug.repeat_threshold,
+    )
+    query_debugger = QueryDebugger(
+        slow_ms=settings.query_debug.slow_ms, explain=settings.query_debug.explain
+    )
+    for engine in (db_helper.engine, *db_helper.replica_engines):
+        query_debugger.instrument(engine)
+
 app.include_router(api_router)
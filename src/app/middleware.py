@@ -0,0 +1,99 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import (
+    http_request_db_duration,
+    http_request_db_queries,
+    http_request_duration,
+    http_requests,
+    http_requests_in_progress,
+    track_queries,
+)
+from app.utils.query_debug import StatementLog, track_statements
+from core import get_logger
+
+logger = get_logger(__name__)
+
+# Route label of requests no route matched, so stray paths add no series.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Records latency, status and database statements of every HTTP request.
+
+    Requests are labelled with their route template (e.g. /videos/{video_id}),
+    not the raw path. Streaming responses are timed until their last chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method=method)
+        started = time.perf_counter()
+        with track_queries() as queries:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                elapsed = time.perf_counter() - started
+                http_requests_in_progress.dec(method=method)
+
+                route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+                labels = dict(method=method, route=route)
+                http_requests.inc(status=str(status_code), **labels)
+                http_request_duration.observe(elapsed, **labels)
+                http_request_db_queries.observe(queries.queries, **labels)
+                http_request_db_duration.observe(queries.duration_s, **labels)
+
+
+class QueryBudgetMiddleware:
+    """
+    Logs HTTP requests that run more than max_queries statements, with the
+    statements they repeated at least repeat_threshold times.
+
+    Statements are only seen on engines a QueryDebugger instruments.
+    """
+
+    def __init__(self, app: ASGIApp, max_queries: int, repeat_threshold: int):
+        self.app = app
+        self.max_queries = max_queries
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_statements() as log:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if len(log) > self.max_queries:
+                    self._report(scope, log)
+
+    def _report(self, scope: Scope, log: StatementLog) -> None:
+        route = getattr(scope.get("route"), "path", scope["path"])
+        repeated = "".join(
+            f"\n  {count} x {statement}"
+            for statement, count in log.repeated(self.repeat_threshold)
+        )
+        logger.warning(
+            f"{scope['method']} {route} ran {len(log)} queries "
+            f"(budget {self.max_queries}) in {log.duration_s * 1000:.1f} ms."
+            + (f" Repeated statements:{repeated}" if repeated else "")
+        )
@@ -2,7 +2,10 @@ __all__ = ("router",)
 
 from fastapi import APIRouter
 
-from app.routers.api import video
+from app.routers.api import db, metrics, probe, video
 
 router = APIRouter()
 router.include_router(video.router)
+router.include_router(probe.router)
+router.include_router(db.router)
+router.include_router(metrics.router)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException
+
+from app.schemas import PoolStatsResponse
+from core import db_helper, get_logger
+
+logger = get_logger(__name__)
+router = APIRouter(prefix="/db", tags=["db"])
+
+
+@router.get("/pool/stats", response_model=PoolStatsResponse)
+async def get_pool_stats():
+    logger.info("Getting connection pool stats.")
+    stats = db_helper.pool_stats()
+    if stats is None:
+        raise HTTPException(
+            status_code=404, detail="The connection pool is not instrumented."
+        )
+    return stats
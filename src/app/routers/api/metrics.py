@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+
+from app.utils import METRICS_CONTENT_TYPE, metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=Response)
+async def get_metrics():
+    return Response(metrics.render(), media_type=METRICS_CONTENT_TYPE)
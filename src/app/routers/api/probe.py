@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+
+from app.schemas import ProbeCacheStatsResponse, ProbeStatsResponse
+from app.utils import probe_cache, probe_scheduler
+from core import get_logger
+
+logger = get_logger(__name__)
+router = APIRouter(prefix="/probe", tags=["probe"])
+
+
+@router.get("/stats", response_model=ProbeStatsResponse)
+async def get_probe_stats():
+    logger.info("Getting ffprobe scheduler stats.")
+    return probe_scheduler.stats()
+
+
+@router.get("/cache/stats", response_model=ProbeCacheStatsResponse)
+async def get_probe_cache_stats():
+    logger.info("Getting ffprobe cache stats.")
+    return probe_cache.stats()
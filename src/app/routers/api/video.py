@@ -1,31 +1,167 @@
-from datetime import datetime
-from typing import Annotated
+import asyncio
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas import StatusUpdate, VideoCreate, VideoResponse
-from app.services import VideoService
-from core import db_helper, get_logger
+from app.schemas import (
+    BatchGetRequest,
+    BatchGetResponse,
+    BulkCreateItemResult,
+    BulkCreateResponse,
+    BulkStatusUpdate,
+    BulkStatusUpdateResponse,
+    ClaimResponse,
+    ExportFormat,
+    StatsBucket,
+    StatsDimension,
+    StatsItem,
+    StatsResponse,
+    StatusUpdate,
+    TimeInterval,
+    TimelineResponse,
+    VideoCreate,
+    VideoPage,
+    VideoResponse,
+)
+from app.services import VIDEO_COLUMNS, VideoService
+from app.utils import (
+    EventSubscription,
+    ProbeQueueFullError,
+    etag_matches,
+    event_broker,
+    listing_etag,
+    video_etag,
+)
+from core import db_helper, get_logger, settings
 from core.models import VideoStatus
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/videos", tags=["videos"])
 
+BULK_CREATE_MAX_ITEMS = 10_000
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_LEASE_S = 24 * 60 * 60
 
-@router.get("", response_model=list[VideoResponse])
+
+@router.get("", response_model=VideoPage)
 async def list_videos(
+    request: Request,
     status: Annotated[list[VideoStatus] | None, Query()] = None,
     camera_number: Annotated[list[int] | None, Query()] = None,
     location: Annotated[list[str] | None, Query()] = None,
     start_time_from: datetime | None = Query(default=None),
     start_time_to: datetime | None = Query(default=None),
-    session: AsyncSession = Depends(db_helper.get_scoped_session),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
 ):
     logger.info("Getting list of all videos.")
     logger.debug(f"Running VideoService.list_videos method with session = {session}.")
 
-    videos = await VideoService.list_videos(
+    filters = dict(
+        statuses=status,
+        camera_numbers=camera_number,
+        locations=location,
+        start_time_from=start_time_from,
+        start_time_to=start_time_to,
+        limit=limit,
+        cursor=cursor,
+    )
+    try:
+        etag = None
+        if if_none_match:
+            validator = await VideoService.list_validator(session=session, **filters)
+            etag = listing_etag((*validator, request.url.query))
+            if etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+
+        rows, next_cursor = await VideoService.list_video_rows(
+            session=session, **filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if etag is None:
+        validator = VideoService.page_validator(rows, next_cursor)
+        etag = listing_etag((*validator, request.url.query))
+
+    # Rows are plain column mappings with the VideoResponse fields, so they are
+    # encoded straight to JSON without building ORM objects or Pydantic models.
+    return Response(
+        to_json({"items": [dict(row) for row in rows], "next_cursor": next_cursor}),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
+async def _export_ndjson(
+    partitions: AsyncIterator[Sequence[RowMapping]],
+) -> AsyncIterator[bytes]:
+    async for rows in partitions:
+        yield b"".join(to_json(dict(row)) + b"\n" for row in rows)
+
+
+async def _export_csv(
+    partitions: AsyncIterator[Sequence[RowMapping]],
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(column.key for column in VIDEO_COLUMNS)
+    async for rows in partitions:
+        writer.writerows(
+            (
+                row["id"],
+                row["video_path"],
+                row["start_time"].isoformat(),
+                row["duration"].total_seconds(),
+                row["end_time"].isoformat(),
+                row["camera_number"],
+                row["location"],
+                row["status"].value,
+                row["created_at"].isoformat(),
+                row["version"],
+            )
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+@router.get("/export")
+async def export_videos(
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+    status: Annotated[list[VideoStatus] | None, Query()] = None,
+    camera_number: Annotated[list[int] | None, Query()] = None,
+    location: Annotated[list[str] | None, Query()] = None,
+    start_time_from: datetime | None = Query(default=None),
+    start_time_to: datetime | None = Query(default=None),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    logger.info(f"Exporting videos as {export_format.value}.")
+    logger.debug(f"Running VideoService.stream_videos with session = {session}.")
+
+    partitions = VideoService.stream_videos(
         session=session,
         statuses=status,
         camera_numbers=camera_number,
@@ -33,12 +169,140 @@ async def list_videos(
         start_time_from=start_time_from,
         start_time_to=start_time_to,
     )
-    return videos
+    if export_format is ExportFormat.CSV:
+        return StreamingResponse(
+            _export_csv(partitions),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="videos.csv"'},
+        )
+    return StreamingResponse(
+        _export_ndjson(partitions), media_type="application/x-ndjson"
+    )
+
+
+async def _event_stream(
+    subscription: EventSubscription, keepalive_s: float
+) -> AsyncIterator[str]:
+    """Server-Sent Events frames for the subscription, with idle keepalives."""
+
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), keepalive_s)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            yield f"event: {event.type}\ndata: {event.to_json()}\n\n"
+    finally:
+        event_broker.unsubscribe(subscription)
+
+
+@router.get("/events")
+async def stream_events(
+    status: Annotated[list[VideoStatus] | None, Query()] = None,
+    camera_number: Annotated[list[int] | None, Query()] = None,
+):
+    logger.info("Opening a video event stream.")
+    subscription = event_broker.subscribe(
+        camera_numbers=camera_number,
+        statuses=[video_status.value for video_status in status or ()],
+    )
+    return StreamingResponse(
+        _event_stream(subscription, settings.events.keepalive_s),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats(
+    group_by: Annotated[list[StatsDimension] | None, Query()] = None,
+    bucket: StatsBucket | None = Query(default=None),
+    status: Annotated[list[VideoStatus] | None, Query()] = None,
+    camera_number: Annotated[list[int] | None, Query()] = None,
+    location: Annotated[list[str] | None, Query()] = None,
+    start_time_from: datetime | None = Query(default=None),
+    start_time_to: datetime | None = Query(default=None),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    group_by = list(dict.fromkeys(group_by or ()))
+    logger.info(
+        f"Getting video stats by {[dimension.value for dimension in group_by]}"
+        f" and bucket {bucket.value if bucket else None}."
+    )
+    try:
+        rows = await VideoService.get_stats(
+            session,
+            group_by=group_by,
+            bucket=bucket,
+            statuses=status,
+            camera_numbers=camera_number,
+            locations=location,
+            start_time_from=start_time_from,
+            start_time_to=start_time_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StatsResponse(
+        group_by=group_by,
+        bucket=bucket,
+        items=[StatsItem.model_validate(row) for row in rows],
+    )
+
+
+@router.get("/timeline", response_model=TimelineResponse)
+async def get_timeline(
+    camera_number: int = Query(gt=0),
+    time_from: datetime = Query(alias="from"),
+    time_to: datetime = Query(alias="to"),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    logger.info(
+        f"Getting timeline of camera {camera_number} from {time_from} to {time_to}."
+    )
+    try:
+        timeline = await VideoService.get_timeline(
+            session, camera_number, time_from, time_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    def to_schema(intervals):
+        return [TimeInterval(start=start, end=end) for start, end in intervals]
 
+    return TimelineResponse(
+        camera_number=camera_number,
+        start=timeline.start,
+        end=timeline.end,
+        covered=to_schema(timeline.covered),
+        gaps=to_schema(timeline.gaps),
+        overlaps=to_schema(timeline.overlaps),
+    )
+
+
+@router.get("/at", response_model=list[VideoResponse])
+async def find_videos_at(
+    camera_number: int = Query(gt=0),
+    ts: datetime = Query(),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    logger.info(f"Finding videos of camera {camera_number} containing {ts}.")
+    logger.debug(f"Running VideoService.find_videos_at with session = {session}.")
+
+    return await VideoService.find_videos_at(session, camera_number, ts)
+
+
+# Served from the video cache; misses load from the primary, since a lagging
+# replica could refill the cache with a row a write has just invalidated.
 @router.get("/{video_id}", response_model=VideoResponse)
 async def get_video(
-    video_id: int, session: AsyncSession = Depends(db_helper.get_scoped_session)
+    video_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     logger.info(f"Getting a video with id: {video_id}.")
     try:
@@ -51,12 +315,21 @@ async def get_video(
         logger.error(f"VideoService.get_video raised KeyError: {e}.")
         raise HTTPException(status_code=404, detail=str(e))
 
+    etag = video_etag(video.id, video.version)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return video
 
 
-@router.post("", response_model=VideoResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=VideoResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(db_helper.stick_to_primary)],
+)
 async def create_video(
-    data: VideoCreate, session: AsyncSession = Depends(db_helper.get_scoped_session)
+    data: VideoCreate, session: AsyncSession = Depends(db_helper.session_dependency)
 ):
     logger.info("Creating a video with given data.")
     logger.debug(
@@ -66,13 +339,158 @@ async def create_video(
         return await VideoService.create_video(data, session)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except ProbeQueueFullError as e:
+        logger.warning(f"VideoService.create_video rejected by probe scheduler: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after_s)},
+        )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResponse,
+    dependencies=[Depends(db_helper.stick_to_primary)],
+)
+async def create_videos(
+    items: Annotated[
+        list[dict[str, Any]], Body(min_length=1, max_length=BULK_CREATE_MAX_ITEMS)
+    ],
+    session: AsyncSession = Depends(db_helper.session_dependency),
+):
+    logger.info(f"Creating {len(items)} videos in bulk.")
+    logger.debug(f"Running VideoService.create_videos with session = {session}.")
+
+    results = await VideoService.create_videos(items, session)
+    response_items = [
+        (
+            BulkCreateItemResult(index=index, error=result)
+            if isinstance(result, str)
+            else BulkCreateItemResult(
+                index=index, video=VideoResponse.model_validate(result)
+            )
+        )
+        for index, result in enumerate(results)
+    ]
+    failed = sum(1 for item in response_items if item.error is not None)
+    if failed:
+        logger.warning(f"Bulk create rejected {failed} of {len(items)} videos.")
+
+    return BulkCreateResponse(
+        created=len(items) - failed, failed=failed, items=response_items
+    )
+
+
+@router.post("/batch-get", response_model=BatchGetResponse)
+async def batch_get_videos(
+    request: BatchGetRequest,
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    logger.info(f"Getting {len(request.ids)} videos by id.")
+    logger.debug(f"Running VideoService.get_video_rows with session = {session}.")
+
+    rows, missing = await VideoService.get_video_rows(session, request.ids)
+    if missing:
+        logger.debug(f"Batch get did not find {len(missing)} videos.")
+
+    return Response(
+        to_json({"items": [dict(row) for row in rows], "missing": missing}),
+        media_type="application/json",
+    )
+
+
+@router.post(
+    "/claim",
+    response_model=ClaimResponse,
+    dependencies=[Depends(db_helper.stick_to_primary)],
+)
+async def claim_videos(
+    status: VideoStatus = Query(default=VideoStatus.NEW),
+    limit: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
+    lease: int = Query(
+        default=60, ge=1, le=MAX_LEASE_S, description="Lease duration in seconds"
+    ),
+    session: AsyncSession = Depends(db_helper.session_dependency),
+):
+    logger.info(f"Claiming up to {limit} videos in status {status.value}.")
+
+    lease_token, lease_expires_at, videos = await VideoService.claim_videos(
+        session, status=status, limit=limit, lease=timedelta(seconds=lease)
+    )
+    logger.debug(f"Lease {lease_token} claimed {len(videos)} videos.")
+    return ClaimResponse(
+        lease_token=lease_token,
+        lease_expires_at=lease_expires_at,
+        items=[VideoResponse.model_validate(video) for video in videos],
+    )
+
+
+@router.patch(
+    "/status",
+    response_model=BulkStatusUpdateResponse,
+    dependencies=[Depends(db_helper.stick_to_primary)],
+)
+async def transition_status(
+    update: BulkStatusUpdate,
+    session: AsyncSession = Depends(db_helper.session_dependency),
+):
+    logger.info(f"Moving videos to status {update.status.value} in bulk.")
+    logger.debug(
+        f"Running VideoService.transition_status with update = {update} and session = {session}."
+    )
+    selection = update.filter.model_dump() if update.filter else {}
+    try:
+        updated, has_more = await VideoService.transition_status(
+            session,
+            target=update.status,
+            expected=update.expected_status,
+            ids=update.ids,
+            camera_numbers=selection.get("camera_number"),
+            locations=selection.get("location"),
+            start_time_from=selection.get("start_time_from"),
+            start_time_to=selection.get("start_time_to"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = BulkStatusUpdateResponse(
+        status=update.status,
+        updated=updated,
+        has_more=has_more,
+    )
+    if response.has_more:
+        logger.info(f"Bulk transition stopped after {len(updated)} videos.")
+    if update.ids is not None:
+        not_updated = sorted(set(update.ids) - set(updated))
+        existing = (
+            await VideoService.existing_ids(session, not_updated)
+            if not_updated
+            else set()
+        )
+        response.skipped = [
+            video_id for video_id in not_updated if video_id in existing
+        ]
+        response.missing = [
+            video_id for video_id in not_updated if video_id not in existing
+        ]
+        if not_updated:
+            logger.warning(
+                f"Skipped {len(response.skipped)} stale and "
+                f"{len(response.missing)} missing videos."
+            )
+    return response
 
 
-@router.patch("/{video_id}/status", response_model=VideoResponse)
+@router.patch(
+    "/{video_id}/status",
+    response_model=VideoResponse,
+    dependencies=[Depends(db_helper.stick_to_primary)],
+)
 async def update_video_status(
     video_id: int,
     status: StatusUpdate,
-    session: AsyncSession = Depends(db_helper.get_scoped_session),
+    session: AsyncSession = Depends(db_helper.session_dependency),
 ):
     logger.info(f"Updating a video's status on video with id: {video_id}.")
     logger.debug(
@@ -1,3 +1,50 @@
-__all__ = ("VideoCreate", "VideoResponse", "VideoStatus", "StatusUpdate")
+__all__ = (
+    "BatchGetRequest",
+    "BatchGetResponse",
+    "BulkCreateItemResult",
+    "BulkCreateResponse",
+    "BulkStatusUpdate",
+    "BulkStatusUpdateResponse",
+    "ClaimResponse",
+    "ExportFormat",
+    "PoolStatsResponse",
+    "ProbeCacheStatsResponse",
+    "ProbeStatsResponse",
+    "VideoCreate",
+    "VideoFilter",
+    "VideoPage",
+    "VideoResponse",
+    "VideoStatus",
+    "StatsBucket",
+    "StatsDimension",
+    "StatsItem",
+    "StatsResponse",
+    "StatusUpdate",
+    "TimeInterval",
+    "TimelineResponse",
+)
 
-from .video import VideoCreate, VideoResponse, VideoStatus, StatusUpdate
+from .db import PoolStatsResponse
+from .probe import ProbeCacheStatsResponse, ProbeStatsResponse
+from .video import (
+    BatchGetRequest,
+    BatchGetResponse,
+    BulkCreateItemResult,
+    BulkCreateResponse,
+    BulkStatusUpdate,
+    BulkStatusUpdateResponse,
+    ClaimResponse,
+    ExportFormat,
+    VideoCreate,
+    VideoFilter,
+    VideoPage,
+    VideoResponse,
+    VideoStatus,
+    StatsBucket,
+    StatsDimension,
+    StatsItem,
+    StatsResponse,
+    StatusUpdate,
+    TimeInterval,
+    TimelineResponse,
+)
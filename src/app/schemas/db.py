@@ -0,0 +1,15 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class PoolStatsResponse(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_s: float
+    max_wait_s: float
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,25 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class ProbeStatsResponse(BaseModel):
+    max_concurrency: int
+    max_queue: int
+    running: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    avg_wait_s: float
+    max_wait_s: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProbeCacheStatsResponse(BaseModel):
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+    model_config = ConfigDict(from_attributes=True)
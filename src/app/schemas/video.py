@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
+from enum import Enum
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 from core.models import VideoStatus
 
@@ -27,11 +28,146 @@ class VideoCreate(VideoBase):
 
 class VideoResponse(VideoBase):
     id: int
+    end_time: datetime = Field(..., description="Время окончания записи")
     status: VideoStatus
     created_at: datetime
+    version: int = Field(..., description="Версия записи")
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class VideoPage(BaseModel):
+    items: list[VideoResponse]
+    next_cursor: str | None = Field(
+        default=None, description="Курсор следующей страницы"
+    )
+
+
+class TimeInterval(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class TimelineResponse(BaseModel):
+    camera_number: int
+    start: datetime = Field(..., description="Начало запрошенного интервала")
+    end: datetime = Field(..., description="Конец запрошенного интервала")
+    covered: list[TimeInterval] = Field(..., description="Покрытые записью интервалы")
+    gaps: list[TimeInterval] = Field(..., description="Интервалы без записи")
+    overlaps: list[TimeInterval] = Field(..., description="Пересечения записей")
+
+
+class ExportFormat(Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class StatsDimension(Enum):
+    CAMERA_NUMBER = "camera_number"
+    LOCATION = "location"
+    STATUS = "status"
+
+
+class StatsBucket(Enum):
+    HOUR = "hour"
+    DAY = "day"
+    MONTH = "month"
+
+
 class StatusUpdate(BaseModel):
     status: VideoStatus
+
+
+class BulkCreateItemResult(BaseModel):
+    index: int
+    video: VideoResponse | None = None
+    error: str | None = None
+
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    failed: int
+    items: list[BulkCreateItemResult]
+
+
+class VideoFilter(BaseModel):
+    camera_number: list[int] | None = Field(default=None, min_length=1)
+    location: list[str] | None = Field(default=None, min_length=1)
+    start_time_from: datetime | None = None
+    start_time_to: datetime | None = None
+
+    @model_validator(mode="after")
+    def check_criteria(self) -> "VideoFilter":
+        if all(value is None for value in self.model_dump().values()):
+            raise ValueError("A filter needs at least one criterion.")
+        return self
+
+
+class BulkStatusUpdate(BaseModel):
+    status: VideoStatus = Field(..., description="Целевой статус")
+    expected_status: VideoStatus | None = Field(
+        default=None, description="Ожидаемый текущий статус"
+    )
+    ids: list[int] | None = Field(default=None, min_length=1, max_length=10_000)
+    filter: VideoFilter | None = None
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "BulkStatusUpdate":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Exactly one of 'ids' or 'filter' must be given.")
+        return self
+
+
+class BulkStatusUpdateResponse(BaseModel):
+    status: VideoStatus
+    updated: list[int]
+    skipped: list[int] = Field(
+        default_factory=list,
+        description="Запрошенные id, чей статус не допускает перехода",
+    )
+    missing: list[int] = Field(
+        default_factory=list, description="Запрошенные id, которых нет"
+    )
+    has_more: bool = Field(
+        default=False,
+        description="Фильтр выбрал больше видео, чем переводится за один запрос; "
+        "повторите запрос для остальных",
+    )
+
+
+class ClaimResponse(BaseModel):
+    lease_token: str = Field(..., description="Токен аренды")
+    lease_expires_at: datetime = Field(..., description="Окончание аренды")
+    items: list[VideoResponse]
+
+
+class BatchGetRequest(BaseModel):
+    ids: list[int] = Field(
+        ..., min_length=1, max_length=10_000, description="Запрошенные id"
+    )
+
+
+class BatchGetResponse(BaseModel):
+    items: list[VideoResponse] = Field(
+        ..., description="Найденные видео в порядке запроса"
+    )
+    missing: list[int] = Field(
+        default_factory=list, description="Запрошенные id, которых нет"
+    )
+
+
+class StatsItem(BaseModel):
+    bucket: datetime | None = Field(
+        default=None, description="Начало интервала группировки (UTC)"
+    )
+    camera_number: int | None = None
+    location: str | None = None
+    status: VideoStatus | None = None
+    count: int = Field(..., description="Количество видео")
+    total_duration: timedelta = Field(..., description="Суммарная длительность")
+
+
+class StatsResponse(BaseModel):
+    group_by: list[StatsDimension]
+    bucket: StatsBucket | None = None
+    items: list[StatsItem]
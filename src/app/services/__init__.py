@@ -1,3 +1,11 @@
-__all__ = ("VideoService",)
+__all__ = (
+    "PartitionService",
+    "RetentionReport",
+    "RetentionService",
+    "VIDEO_COLUMNS",
+    "VideoService",
+)
 
-from .video import VideoService
+from .partitions import PartitionService
+from .retention import RetentionReport, RetentionService
+from .video import VIDEO_COLUMNS, VideoService
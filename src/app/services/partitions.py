@@ -0,0 +1,48 @@
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core import get_logger
+
+logger = get_logger(__name__)
+
+
+class PartitionService:
+    @staticmethod
+    async def ensure_partitions(session: AsyncSession, months_ahead: int) -> int:
+        """
+        Create the monthly videos partitions missing up to months_ahead months
+        from now, returning how many were created.
+
+        Requires the partitioned table and its helper functions installed by
+        the partition_videos migration.
+        """
+
+        created = await session.scalar(
+            select(func.videos_ensure_partitions(months_ahead))
+        )
+        await session.commit()
+        return created
+
+    @staticmethod
+    async def maintain_partitions(
+        session_factory: async_sessionmaker[AsyncSession],
+        months_ahead: int,
+        interval_s: float,
+    ) -> None:
+        """Keep future partitions created, until cancelled."""
+
+        while True:
+            try:
+                async with session_factory() as session:
+                    created = await PartitionService.ensure_partitions(
+                        session, months_ahead
+                    )
+                if created:
+                    logger.info(f"Created {created} videos partitions.")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Creating videos partitions failed.")
+            await asyncio.sleep(interval_s)
@@ -0,0 +1,263 @@
+import asyncio
+import os
+import re
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO
+
+from pydantic_core import to_json
+from sqlalchemy import ColumnElement, and_, delete, not_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.utils import video_cache
+from core import get_logger
+from core.config import RetentionRule, RetentionSettings
+from core.models import Video
+from .video import VIDEO_COLUMNS
+
+logger = get_logger(__name__)
+
+_PARTITION_BOUND = re.compile(r"FOR VALUES FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+@dataclass
+class RetentionReport:
+    deleted: int = 0
+    archived: int = 0
+    dropped_partitions: list[str] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.deleted / self.elapsed_s if self.elapsed_s else 0.0
+
+
+def _scope(rule: RetentionRule) -> list[ColumnElement[bool]]:
+    clauses = []
+    if rule.location is not None:
+        clauses.append(Video.location == rule.location)
+    if rule.camera_number is not None:
+        clauses.append(Video.camera_number == rule.camera_number)
+    return clauses
+
+
+def _narrows(other: RetentionRule, rule: RetentionRule) -> bool:
+    """Whether other applies to a strict subset of the videos rule applies to."""
+
+    fields = ("location", "camera_number")
+    narrower = False
+    for name in fields:
+        value, other_value = getattr(rule, name), getattr(other, name)
+        if value is not None and other_value != value:
+            return False
+        narrower |= value is None and other_value is not None
+    return narrower
+
+
+class RetentionService:
+    @staticmethod
+    def rules_from_settings(retention: RetentionSettings) -> list[RetentionRule]:
+        rules = list(retention.rules)
+        if retention.max_age_days is not None:
+            rules.append(RetentionRule(max_age_days=retention.max_age_days))
+        return rules
+
+    @staticmethod
+    def expired_clauses(
+        rule: RetentionRule, rules: Sequence[RetentionRule], now: datetime
+    ) -> list[ColumnElement[bool]]:
+        """
+        WHERE clauses of the videos the rule expires, leaving out the videos a
+        more specific rule is responsible for.
+        """
+
+        clauses = [
+            Video.start_time < now - timedelta(days=rule.max_age_days),
+            *_scope(rule),
+        ]
+        clauses.extend(
+            not_(and_(*_scope(other))) for other in rules if _narrows(other, rule)
+        )
+        return clauses
+
+    @staticmethod
+    async def purge(
+        session: AsyncSession,
+        rules: Sequence[RetentionRule],
+        batch_size: int,
+        pause_s: float = 0.0,
+        archive: BinaryIO | None = None,
+        drop_partitions: bool = False,
+        now: datetime | None = None,
+    ) -> RetentionReport:
+        """
+        Delete expired videos in keyed batches of batch_size rows.
+
+        Each batch is a DELETE of the oldest matching ids in its own
+        transaction, followed by a pause, so locks stay short and WAL is
+        written at a bounded rate. Deleted rows are appended to the archive as
+        NDJSON before their batch is committed. Whole expired partitions are
+        dropped first when asked to (never while archiving).
+        """
+
+        now = now or datetime.now(timezone.utc)
+        report = RetentionReport()
+        started = time.perf_counter()
+
+        if drop_partitions and archive is None:
+            await RetentionService._drop_partitions(session, rules, now, report)
+
+        for rule in rules:
+            clauses = RetentionService.expired_clauses(rule, rules, now)
+            expired = (
+                select(Video.id)
+                .where(*clauses)
+                .order_by(Video.start_time, Video.id)
+                .limit(batch_size)
+            )
+            while True:
+                result = await session.execute(
+                    delete(Video)
+                    .where(Video.id.in_(expired.scalar_subquery()))
+                    .returning(*VIDEO_COLUMNS)
+                    .execution_options(synchronize_session=False)
+                )
+                rows = result.mappings().all()
+                if archive is not None and rows:
+                    archive.write(b"".join(to_json(dict(row)) + b"\n" for row in rows))
+                    archive.flush()
+                    report.archived += len(rows)
+                await session.commit()
+                await video_cache.invalidate(row["id"] for row in rows)
+
+                report.deleted += len(rows)
+                report.elapsed_s = time.perf_counter() - started
+                if rows:
+                    logger.info(
+                        f"Deleted {report.deleted} expired videos "
+                        f"({report.rows_per_s:.1f} rows/s)."
+                    )
+                if len(rows) < batch_size:
+                    break
+                await asyncio.sleep(pause_s)
+
+        report.elapsed_s = time.perf_counter() - started
+        return report
+
+    @staticmethod
+    async def _drop_partitions(
+        session: AsyncSession,
+        rules: Sequence[RetentionRule],
+        now: datetime,
+        report: RetentionReport,
+    ) -> None:
+        """
+        Drop monthly partitions that hold only videos every rule has expired.
+
+        Only possible with a catch-all rule, since otherwise some videos are
+        kept forever; the longest max age of all rules bounds the cutoff. The
+        video cache is cleared afterwards.
+        """
+
+        if session.get_bind().dialect.name != "postgresql":
+            return
+        if not any(
+            rule.location is None and rule.camera_number is None for rule in rules
+        ):
+            return
+        partitioned = await session.scalar(
+            text("SELECT relkind = 'p' FROM pg_class WHERE oid = 'videos'::regclass")
+        )
+        if not partitioned:
+            return
+
+        cutoff = now - timedelta(days=max(rule.max_age_days for rule in rules))
+        partitions = await session.execute(
+            text(
+                "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+                "FROM pg_inherits JOIN pg_class AS child "
+                "ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = 'videos'::regclass"
+            )
+        )
+        for name, bound in partitions.all():
+            match = _PARTITION_BOUND.fullmatch(bound)
+            if match is None or datetime.fromisoformat(match[2]) > cutoff:
+                continue
+
+            rows = await session.scalar(text(f'SELECT count(*) FROM "{name}"'))
+            await session.execute(text(f'ALTER TABLE videos DETACH PARTITION "{name}"'))
+            await session.execute(text(f'DROP TABLE "{name}"'))
+            await session.commit()
+            report.deleted += rows
+            report.dropped_partitions.append(name)
+            logger.info(f"Dropped partition {name} with {rows} expired videos.")
+
+        if report.dropped_partitions:
+            # Dropped rows have no ids to invalidate one by one.
+            await video_cache.clear()
+
+    @staticmethod
+    def archive_path(archive_dir: str, now: datetime) -> str:
+        return os.path.join(
+            archive_dir, f"videos-{now.astimezone(timezone.utc):%Y%m%dT%H%M%SZ}.ndjson"
+        )
+
+    @staticmethod
+    async def purge_periodically(
+        session_factory: async_sessionmaker[AsyncSession],
+        retention: RetentionSettings,
+    ) -> None:
+        """Run the configured purge every retention.interval_s, until cancelled."""
+
+        while True:
+            try:
+                async with session_factory() as session:
+                    report = await RetentionService.purge_with_settings(
+                        session, retention
+                    )
+                if report.deleted:
+                    logger.info(
+                        f"Retention purge deleted {report.deleted} videos "
+                        f"in {report.elapsed_s:.1f}s."
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Retention purge failed.")
+            await asyncio.sleep(retention.interval_s)
+
+    @staticmethod
+    async def purge_with_settings(
+        session: AsyncSession,
+        retention: RetentionSettings,
+        archive_path: str | None = None,
+    ) -> RetentionReport:
+        """
+        Purge with the rules and batching of retention, archiving to
+        archive_path or else to a new file in retention.archive_dir. An
+        archive file this purge created is removed if nothing was archived.
+        """
+
+        now = datetime.now(timezone.utc)
+        options = dict(
+            rules=RetentionService.rules_from_settings(retention),
+            batch_size=retention.batch_size,
+            pause_s=retention.pause_s,
+            drop_partitions=retention.drop_partitions,
+            now=now,
+        )
+        if archive_path is None and retention.archive_dir is not None:
+            archive_path = RetentionService.archive_path(retention.archive_dir, now)
+        if archive_path is None:
+            return await RetentionService.purge(session, **options)
+
+        created = not os.path.exists(archive_path)
+        try:
+            with open(archive_path, "ab") as archive:
+                return await RetentionService.purge(session, archive=archive, **options)
+        finally:
+            if created and os.path.getsize(archive_path) == 0:
+                os.remove(archive_path)
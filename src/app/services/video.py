@@ -1,98 +1,923 @@
-from collections.abc import Sequence
-from datetime import datetime, timedelta
+import asyncio
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import batched, chain
+from typing import Any
 
-from sqlalchemy import Select, select
+from pydantic import ValidationError
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    RowMapping,
+    Select,
+    case,
+    exists,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas import StatusUpdate, VideoCreate
-from app.utils import FFProbeError, probe_video
+from app.schemas import (
+    StatsBucket,
+    StatsDimension,
+    StatusUpdate,
+    VideoCreate,
+    VideoResponse,
+)
+from app.utils import (
+    FFProbeError,
+    Interval,
+    ProbeQueueFullError,
+    ProbeResult,
+    VideoEvent,
+    decode_cursor,
+    encode_cursor,
+    event_broker,
+    find_gaps,
+    merge_intervals,
+    notify_statement,
+    probe_cache,
+    probe_scheduler,
+    probe_video_async,
+    video_cache,
+)
+from core import settings
 from core.models import Video, VideoStatus
 
+VIDEO_COLUMNS = (
+    Video.id,
+    Video.video_path,
+    Video.start_time,
+    Video.duration,
+    Video.end_time,
+    Video.camera_number,
+    Video.location,
+    Video.status,
+    Video.created_at,
+    Video.version,
+)
+
+# Ids per IN (...) list, well under the bind parameter limits of the drivers.
+BATCH_GET_CHUNK_SIZE = 1000
+
+# Filter-based status transitions update keyed batches of this many rows, each
+# in its own transaction, and stop after BULK_STATUS_MAX_ROWS per request.
+BULK_STATUS_BATCH_SIZE = 1000
+BULK_STATUS_MAX_ROWS = 10_000
+
+# Largest number of groups GET /videos/stats returns before asking for filters.
+STATS_MAX_GROUPS = 10_000
+
+# strftime patterns truncating SQLite timestamps to the start of a bucket.
+_SQLITE_BUCKET_FORMATS = {
+    StatsBucket.HOUR: "%Y-%m-%d %H:00:00",
+    StatsBucket.DAY: "%Y-%m-%d 00:00:00",
+    StatsBucket.MONTH: "%Y-%m-01 00:00:00",
+}
+
+# Legal predecessors of each status in the transcoding/recognition pipeline.
+STATUS_TRANSITIONS: dict[VideoStatus, tuple[VideoStatus, ...]] = {
+    VideoStatus.NEW: (),
+    VideoStatus.TRANSCODED: (VideoStatus.NEW,),
+    VideoStatus.RECOGNIZED: (VideoStatus.TRANSCODED,),
+}
+
+
+# Whether a next page exists, then the id and version of each row of the page.
+ListValidator = tuple[bool, *tuple[int, ...]]
+
+
+@dataclass(frozen=True)
+class Timeline:
+    start: datetime
+    end: datetime
+    covered: list[Interval]
+    gaps: list[Interval]
+    overlaps: list[Interval]
+
+
+def _time_range():
+    """The tstzrange expression indexed by ix_videos_camera_number_time_range."""
+
+    return func.tstzrange(Video.start_time, Video.end_time)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
 
 class VideoService:
     @staticmethod
-    async def list_videos(
-        session: AsyncSession,
+    def filter_clauses(
         statuses: Sequence[VideoStatus] | None = None,
         camera_numbers: Sequence[int] | None = None,
         locations: Sequence[str] | None = None,
         start_time_from: datetime | None = None,
         start_time_to: datetime | None = None,
-    ) -> Sequence[Video]:
-        """List videos with optional filters."""
-
-        query: Select[tuple[Video]] = select(Video)
+    ) -> list[ColumnElement[bool]]:
+        """Build the WHERE clauses of the list_videos filters."""
 
+        clauses = []
         if statuses:
-            query = query.where(Video.status.in_(statuses))
+            clauses.append(Video.status.in_(statuses))
         if camera_numbers:
-            query = query.where(Video.camera_number.in_(camera_numbers))
+            clauses.append(Video.camera_number.in_(camera_numbers))
         if locations:
-            query = query.where(Video.location.in_(locations))
+            clauses.append(Video.location.in_(locations))
         if start_time_from:
-            query = query.where(Video.start_time >= start_time_from)
+            clauses.append(Video.start_time >= start_time_from)
         if start_time_to:
-            query = query.where(Video.start_time <= start_time_to)
+            clauses.append(Video.start_time <= start_time_to)
+        return clauses
+
+    @staticmethod
+    def apply_filters(
+        query: Select,
+        statuses: Sequence[VideoStatus] | None = None,
+        camera_numbers: Sequence[int] | None = None,
+        locations: Sequence[str] | None = None,
+        start_time_from: datetime | None = None,
+        start_time_to: datetime | None = None,
+    ) -> Select:
+        """Apply the list_videos filters to a query over videos."""
+
+        return query.where(
+            *VideoService.filter_clauses(
+                statuses=statuses,
+                camera_numbers=camera_numbers,
+                locations=locations,
+                start_time_from=start_time_from,
+                start_time_to=start_time_to,
+            )
+        )
+
+    @staticmethod
+    def apply_keyset(query: Select, cursor: str | None = None) -> Select:
+        """Order newest first and skip the rows up to and including the cursor."""
+
+        if cursor is not None:
+            start_time, video_id = decode_cursor(cursor)
+            query = query.where(
+                Video.start_time <= start_time,
+                or_(Video.start_time < start_time, Video.id < video_id),
+            )
+        return query.order_by(Video.start_time.desc(), Video.id.desc())
+
+    @staticmethod
+    async def list_videos(
+        session: AsyncSession,
+        statuses: Sequence[VideoStatus] | None = None,
+        camera_numbers: Sequence[int] | None = None,
+        locations: Sequence[str] | None = None,
+        start_time_from: datetime | None = None,
+        start_time_to: datetime | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[Sequence[Video], str | None]:
+        """
+        List videos with optional filters, newest first.
+
+        Pages are keyed on (start_time, id): pass the returned next cursor to
+        continue after the last row instead of using an OFFSET.
+        """
+
+        query = VideoService._page_query(
+            select(Video),
+            statuses=statuses,
+            camera_numbers=camera_numbers,
+            locations=locations,
+            start_time_from=start_time_from,
+            start_time_to=start_time_to,
+            limit=limit,
+            cursor=cursor,
+        )
+
+        result = await session.execute(query)
+        videos = result.scalars().all()
+
+        if limit is None or len(videos) <= limit:
+            return videos, None
+        videos = videos[:limit]
+        return videos, encode_cursor(videos[-1].start_time, videos[-1].id)
+
+    @staticmethod
+    async def list_video_rows(
+        session: AsyncSession,
+        statuses: Sequence[VideoStatus] | None = None,
+        camera_numbers: Sequence[int] | None = None,
+        locations: Sequence[str] | None = None,
+        start_time_from: datetime | None = None,
+        start_time_to: datetime | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[Sequence[RowMapping], str | None]:
+        """
+        Same as list_videos, but returns plain column mappings instead of
+        hydrated Video objects, for callers that only serialize the rows.
+        """
 
-        query = query.order_by(Video.start_time.desc())
+        query = VideoService._page_query(
+            select(*VIDEO_COLUMNS),
+            statuses=statuses,
+            camera_numbers=camera_numbers,
+            locations=locations,
+            start_time_from=start_time_from,
+            start_time_to=start_time_to,
+            limit=limit,
+            cursor=cursor,
+        )
 
         result = await session.execute(query)
+        rows = result.mappings().all()
+
+        if limit is None or len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1]["start_time"], rows[-1]["id"])
+
+    @staticmethod
+    async def list_validator(
+        session: AsyncSession,
+        statuses: Sequence[VideoStatus] | None = None,
+        camera_numbers: Sequence[int] | None = None,
+        locations: Sequence[str] | None = None,
+        start_time_from: datetime | None = None,
+        start_time_to: datetime | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> ListValidator:
+        """
+        The (id, version) pairs of the matching list_videos page, in page
+        order, after whether a next page exists.
+
+        Only ids and versions of the page rows are read, so it is much cheaper
+        than fetching the page, and any change to which rows are on the page
+        or to one of them changes it. Equals page_validator of the fetched page.
+        """
+
+        page = VideoService._page_query(
+            select(Video.id, Video.version),
+            statuses=statuses,
+            camera_numbers=camera_numbers,
+            locations=locations,
+            start_time_from=start_time_from,
+            start_time_to=start_time_to,
+            limit=limit,
+            cursor=cursor,
+        )
+        rows = (await session.execute(page)).all()
+        # The extra row fetched past the limit only decides whether there is a
+        # next page.
+        has_next = limit is not None and len(rows) > limit
+        return (has_next, *chain.from_iterable(rows[:limit]))
+
+    @staticmethod
+    def page_validator(
+        rows: Sequence[RowMapping], next_cursor: str | None
+    ) -> ListValidator:
+        """The list_validator pairs computed from an already fetched page."""
+
+        return (
+            next_cursor is not None,
+            *chain.from_iterable((row["id"], row["version"]) for row in rows),
+        )
+
+    @staticmethod
+    def _page_query(
+        query: Select,
+        statuses: Sequence[VideoStatus] | None,
+        camera_numbers: Sequence[int] | None,
+        locations: Sequence[str] | None,
+        start_time_from: datetime | None,
+        start_time_to: datetime | None,
+        limit: int | None,
+        cursor: str | None,
+    ) -> Select:
+        query = VideoService.apply_filters(
+            query,
+            statuses=statuses,
+            camera_numbers=camera_numbers,
+            locations=locations,
+            start_time_from=start_time_from,
+            start_time_to=start_time_to,
+        )
+        query = VideoService.apply_keyset(query, cursor)
+        if limit is not None:
+            query = query.limit(limit + 1)
+        return query
+
+    @staticmethod
+    async def stream_videos(
+        session: AsyncSession,
+        statuses: Sequence[VideoStatus] | None = None,
+        camera_numbers: Sequence[int] | None = None,
+        locations: Sequence[str] | None = None,
+        start_time_from: datetime | None = None,
+        start_time_to: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Stream the filtered videos as batches of plain rows through a
+        server-side cursor, so memory use does not grow with the result.
+        """
+
+        query = VideoService.apply_keyset(
+            VideoService.apply_filters(
+                select(*VIDEO_COLUMNS),
+                statuses=statuses,
+                camera_numbers=camera_numbers,
+                locations=locations,
+                start_time_from=start_time_from,
+                start_time_to=start_time_to,
+            )
+        )
+
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.mappings().partitions():
+            yield partition
+
+    @staticmethod
+    async def get_timeline(
+        session: AsyncSession,
+        camera_number: int,
+        time_from: datetime,
+        time_to: datetime,
+    ) -> Timeline:
+        """
+        Describe how a camera's clips cover [time_from, time_to): the merged
+        covered spans, the gaps between them and the overlapping parts.
+        """
+
+        time_from, time_to = _as_utc(time_from), _as_utc(time_to)
+        if time_to <= time_from:
+            raise ValueError("'to' must be later than 'from'.")
+
+        if session.get_bind().dialect.name == "postgresql":
+            covered, overlaps = await VideoService._merge_clips_in_db(
+                session, camera_number, time_from, time_to
+            )
+        else:
+            max_duration = await VideoService._max_duration(session, camera_number)
+            clips = []
+            if max_duration is not None:
+                result = await session.execute(
+                    select(Video.start_time, Video.end_time)
+                    .where(
+                        Video.camera_number == camera_number,
+                        Video.start_time >= time_from - max_duration,
+                        Video.start_time < time_to,
+                        Video.end_time > time_from,
+                    )
+                    .order_by(Video.start_time)
+                )
+                clips = result.all()
+            covered, overlaps = merge_intervals(
+                (max(_as_utc(start), time_from), min(_as_utc(end), time_to))
+                for start, end in clips
+            )
+
+        return Timeline(
+            start=time_from,
+            end=time_to,
+            covered=covered,
+            gaps=find_gaps(covered, time_from, time_to),
+            overlaps=overlaps,
+        )
+
+    @staticmethod
+    async def find_videos_at(
+        session: AsyncSession, camera_number: int, ts: datetime
+    ) -> Sequence[Video]:
+        """Find the camera's clips whose [start_time, end_time) contains ts."""
+
+        ts = _as_utc(ts)
+        query = select(Video).where(Video.camera_number == camera_number)
+
+        if session.get_bind().dialect.name == "postgresql":
+            query = query.where(_time_range().op("@>")(ts))
+        else:
+            max_duration = await VideoService._max_duration(session, camera_number)
+            if max_duration is None:
+                return []
+            query = query.where(
+                Video.start_time > ts - max_duration,
+                Video.start_time <= ts,
+                Video.end_time > ts,
+            )
+
+        result = await session.execute(query.order_by(Video.start_time.desc()))
         return result.scalars().all()
 
     @staticmethod
-    async def get_video(video_id: int, session: AsyncSession) -> Video:
-        """Get a video by id."""
+    async def _max_duration(
+        session: AsyncSession, camera_number: int
+    ) -> timedelta | None:
+        """
+        Return the camera's longest clip, a single seek on
+        (camera_number, duration).
 
-        video = await session.get(Video, video_id)
+        It bounds how long before an instant a clip containing that instant
+        may start, which keeps lookups a range scan on
+        (camera_number, start_time) where no range index is available.
+        """
 
-        if not video:
+        return await session.scalar(
+            select(func.max(Video.duration)).where(Video.camera_number == camera_number)
+        )
+
+    @staticmethod
+    async def _merge_clips_in_db(
+        session: AsyncSession,
+        camera_number: int,
+        time_from: datetime,
+        time_to: datetime,
+    ) -> tuple[list[Interval], list[Interval]]:
+        """Merge clips into covered spans with window functions (PostgreSQL)."""
+
+        clips = (
+            select(
+                func.greatest(Video.start_time, time_from).label("start"),
+                func.least(Video.end_time, time_to).label("end"),
+            )
+            .where(
+                Video.camera_number == camera_number,
+                _time_range().op("&&")(func.tstzrange(time_from, time_to)),
+            )
+            .subquery()
+        )
+        running = select(
+            clips.c.start,
+            clips.c.end,
+            func.max(clips.c.end)
+            .over(order_by=(clips.c.start, clips.c.end), rows=(None, 0))
+            .label("running_end"),
+        ).subquery()
+        marked = select(
+            running.c.start,
+            running.c.end,
+            func.lag(running.c.running_end)
+            .over(order_by=(running.c.start, running.c.end))
+            .label("previous_end"),
+        ).subquery()
+        islands = select(
+            marked.c.start,
+            marked.c.end,
+            func.sum(
+                case(
+                    (
+                        or_(
+                            marked.c.previous_end.is_(None),
+                            marked.c.start > marked.c.previous_end,
+                        ),
+                        1,
+                    ),
+                    else_=0,
+                )
+            )
+            .over(order_by=(marked.c.start, marked.c.end), rows=(None, 0))
+            .label("island"),
+        ).subquery()
+
+        covered = await session.execute(
+            select(func.min(islands.c.start), func.max(islands.c.end))
+            .group_by(islands.c.island)
+            .order_by(func.min(islands.c.start))
+        )
+        overlaps = await session.execute(
+            select(marked.c.start, func.least(marked.c.end, marked.c.previous_end))
+            .where(marked.c.previous_end > marked.c.start)
+            .order_by(marked.c.start)
+        )
+        return [tuple(row) for row in covered], [tuple(row) for row in overlaps]
+
+    @staticmethod
+    async def get_stats(
+        session: AsyncSession,
+        group_by: Sequence[StatsDimension] = (),
+        bucket: StatsBucket | None = None,
+        statuses: Sequence[VideoStatus] | None = None,
+        camera_numbers: Sequence[int] | None = None,
+        locations: Sequence[str] | None = None,
+        start_time_from: datetime | None = None,
+        start_time_to: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Count videos and sum their durations per group, in a single aggregate.
+
+        Groups are the requested dimensions and, optionally, the UTC hour, day
+        or month of start_time. Raises ValueError past STATS_MAX_GROUPS groups.
+        """
+
+        groups = [getattr(Video, dimension.value) for dimension in group_by]
+        if bucket is not None:
+            # Literals rather than bind parameters, so PostgreSQL sees the same
+            # expression in SELECT and GROUP BY.
+            if session.get_bind().dialect.name == "postgresql":
+                bucket_start = func.date_trunc(
+                    literal_column(f"'{bucket.value}'"),
+                    Video.start_time,
+                    literal_column("'UTC'"),
+                    type_=DateTime(timezone=True),
+                )
+            else:
+                bucket_start = func.strftime(
+                    literal_column(f"'{_SQLITE_BUCKET_FORMATS[bucket]}'"),
+                    Video.start_time,
+                    type_=DateTime(),
+                )
+            groups.insert(0, bucket_start.label("bucket"))
+
+        query = VideoService.apply_filters(
+            select(
+                *groups,
+                func.count().label("count"),
+                func.sum(Video.duration).label("total_duration"),
+            ),
+            statuses=statuses,
+            camera_numbers=camera_numbers,
+            locations=locations,
+            start_time_from=start_time_from,
+            start_time_to=start_time_to,
+        )
+        if groups:
+            query = query.group_by(*groups).order_by(*groups)
+
+        result = await session.execute(query.limit(STATS_MAX_GROUPS + 1))
+        rows = [dict(row) for row in result.mappings()]
+        if len(rows) > STATS_MAX_GROUPS:
+            raise ValueError(
+                f"More than {STATS_MAX_GROUPS} groups, narrow the filters or use "
+                "a coarser bucket."
+            )
+
+        for row in rows:
+            if row["total_duration"] is None:
+                row["total_duration"] = timedelta(0)
+            if bucket is not None:
+                row["bucket"] = _as_utc(row["bucket"])
+        return rows
+
+    @staticmethod
+    async def get_video(video_id: int, session: AsyncSession) -> VideoResponse:
+        """Get a video by id, through the video cache."""
+
+        async def load() -> bytes | None:
+            video = await session.get(Video, video_id)
+            if not video:
+                return None
+            return VideoResponse.model_validate(video).model_dump_json().encode()
+
+        payload = await video_cache.get_or_load(video_id, load)
+        if payload is None:
             raise KeyError(f"Video with id: {video_id} not found.")
 
-        return video
+        return VideoResponse.model_validate_json(payload)
+
+    @staticmethod
+    async def get_video_rows(
+        session: AsyncSession, ids: Sequence[int]
+    ) -> tuple[list[RowMapping], list[int]]:
+        """
+        Fetch many videos by id as column mappings.
+
+        Ids are resolved with one IN query per chunk. Found rows are returned
+        in the requested order without duplicates, along with the missing ids.
+        """
+
+        ids = list(dict.fromkeys(ids))
+        found: dict[int, RowMapping] = {}
+        for chunk in batched(ids, BATCH_GET_CHUNK_SIZE):
+            result = await session.execute(
+                select(*VIDEO_COLUMNS).where(Video.id.in_(chunk))
+            )
+            found.update((row["id"], row) for row in result.mappings())
+
+        rows = [found[video_id] for video_id in ids if video_id in found]
+        missing = [video_id for video_id in ids if video_id not in found]
+        return rows, missing
 
     @staticmethod
     async def create_video(data: VideoCreate, session: AsyncSession) -> Video:
         """Create a new video."""
 
-        payload = data.model_dump()
-
-        if payload.get("duration") is None or payload.get("start_time") is None:
-            try:
-                probe = probe_video(payload["video_path"])
-            except FFProbeError as e:
-                raise ValueError(
-                    f"Unable to read video metadata via ffprobe: {e}"
-                ) from e
-
-            if payload.get("duration") is None:
-                if probe.duration is None or probe.duration <= timedelta(0):
-                    raise ValueError("Unable to determine duration via ffprobe.")
-                payload["duration"] = probe.duration
-
-            if payload.get("start_time") is None:
-                if probe.creation_time is None:
-                    raise ValueError(
-                        "Unable to determine start_time via ffprobe (creation_time tag missing)."
-                    )
-                payload["start_time"] = probe.creation_time
+        payload = await VideoService._resolve_metadata(data.model_dump())
 
         video = Video(**payload)
         session.add(video)
         await session.commit()
         await session.refresh(video)
+        await VideoService.publish_events(session, "created", [video])
         return video
 
+    @staticmethod
+    async def create_videos(
+        items: Sequence[dict[str, Any]], session: AsyncSession
+    ) -> list[Video | str]:
+        """
+        Create many videos with a single multi-row INSERT.
+
+        Every item is validated and probed on its own; the result holds either
+        the created video or an error message, in the order of the items.
+        """
+
+        semaphore = asyncio.Semaphore(settings.probe.max_concurrency)
+
+        async def prepare(item: dict[str, Any]) -> dict[str, Any] | str:
+            try:
+                data = VideoCreate.model_validate(item)
+                async with semaphore:
+                    return await VideoService._resolve_metadata(data.model_dump())
+            except ValidationError as e:
+                return "; ".join(
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                    for error in e.errors()
+                )
+            except (ValueError, ProbeQueueFullError) as e:
+                return str(e)
+
+        prepared = await asyncio.gather(*(prepare(item) for item in items))
+        rows = [row for row in prepared if isinstance(row, dict)]
+        if not rows:
+            return prepared
+
+        videos = (
+            await session.scalars(
+                insert(Video).returning(Video, sort_by_parameter_order=True), rows
+            )
+        ).all()
+        await session.commit()
+        await VideoService.publish_events(session, "created", videos)
+
+        created = iter(videos)
+        return [next(created) if isinstance(row, dict) else row for row in prepared]
+
+    @staticmethod
+    async def insert_videos(
+        rows: Sequence[dict[str, Any]], session: AsyncSession
+    ) -> None:
+        """Insert already resolved video rows in one executemany batch."""
+
+        if not rows:
+            return
+        result = await session.execute(
+            insert(Video).returning(*VIDEO_COLUMNS),
+            [{**row, "end_time": row["start_time"] + row["duration"]} for row in rows],
+        )
+        created = result.mappings().all()
+        await session.commit()
+        await VideoService.publish_events(session, "created", created)
+
+    @staticmethod
+    async def _resolve_metadata(payload: dict[str, Any]) -> dict[str, Any]:
+        """Fill in a missing duration or start_time via ffprobe, derive end_time."""
+
+        if payload.get("duration") is None or payload.get("start_time") is None:
+            await VideoService._probe_metadata(payload)
+
+        payload["end_time"] = payload["start_time"] + payload["duration"]
+        return payload
+
+    @staticmethod
+    async def _probe_metadata(payload: dict[str, Any]) -> None:
+        """Fill in a missing duration or start_time via ffprobe."""
+
+        try:
+            probe = await VideoService._probe(payload["video_path"])
+        except FFProbeError as e:
+            raise ValueError(f"Unable to read video metadata via ffprobe: {e}") from e
+
+        if payload.get("duration") is None:
+            if probe.duration is None or probe.duration <= timedelta(0):
+                raise ValueError("Unable to determine duration via ffprobe.")
+            payload["duration"] = probe.duration
+
+        if payload.get("start_time") is None:
+            if probe.creation_time is None:
+                raise ValueError(
+                    "Unable to determine start_time via ffprobe (creation_time tag missing)."
+                )
+            payload["start_time"] = probe.creation_time
+
+    @staticmethod
+    async def _probe(video_path: str) -> ProbeResult:
+        """Probe a video, reusing a cached result for unchanged sources."""
+
+        key = await probe_cache.key_for_async(video_path)
+        if key is not None:
+            cached = await probe_cache.get_async(key)
+            if cached is not None:
+                return cached
+
+        probe = await probe_scheduler.run(
+            probe_video_async, video_path, timeout_s=settings.probe.timeout_s
+        )
+        if key is not None:
+            await probe_cache.set_async(key, probe)
+        return probe
+
     @staticmethod
     async def update_video_status(
         video_id: int, update: StatusUpdate, session: AsyncSession
     ) -> Video:
-        """Update a video status."""
+        """Update a video status, releasing any claim on it."""
 
         video = await session.get(Video, video_id)
         if not video:
             raise KeyError(f"Video with id: {video_id} not found.")
 
         video.status = update.status
+        video.version = Video.version + 1
+        video.lease_token = None
+        video.lease_expires_at = None
         await session.commit()
+        await video_cache.invalidate([video_id])
         await session.refresh(video)
+        await VideoService.publish_events(session, "status", [video])
         return video
+
+    @staticmethod
+    async def transition_status(
+        session: AsyncSession,
+        target: VideoStatus,
+        expected: VideoStatus | None = None,
+        ids: Sequence[int] | None = None,
+        camera_numbers: Sequence[int] | None = None,
+        locations: Sequence[str] | None = None,
+        start_time_from: datetime | None = None,
+        start_time_to: datetime | None = None,
+        max_rows: int = BULK_STATUS_MAX_ROWS,
+    ) -> tuple[list[int], bool]:
+        """
+        Move the selected videos to the target status.
+
+        Only rows whose current status is a legal predecessor of the target
+        (or exactly the expected status, if given) are updated. Returns the ids
+        of the updated rows and whether selected rows were left for another
+        call. Explicit ids are updated in one UPDATE. A filter is scanned by
+        id in keyed batches of BULK_STATUS_BATCH_SIZE rows, each updated and
+        committed on its own, and the scan stops after max_rows rows.
+        """
+
+        allowed = STATUS_TRANSITIONS[target]
+        if expected is not None:
+            if expected not in allowed:
+                raise ValueError(
+                    f"Transition from {expected.value} to {target.value} is not allowed."
+                )
+            allowed = (expected,)
+        if not allowed:
+            raise ValueError(f"No status can transition to {target.value}.")
+
+        if ids is not None:
+            updated = await VideoService._transition_rows(
+                session, target, allowed, Video.id.in_(ids)
+            )
+            return updated, False
+
+        clauses = VideoService.filter_clauses(
+            camera_numbers=camera_numbers,
+            locations=locations,
+            start_time_from=start_time_from,
+            start_time_to=start_time_to,
+        )
+        if not clauses:
+            raise ValueError("A filter needs at least one criterion.")
+        selected = [Video.status.in_(allowed), *clauses]
+
+        updated: list[int] = []
+        scanned = 0
+        last_id = 0
+        while scanned < max_rows:
+            limit = min(BULK_STATUS_BATCH_SIZE, max_rows - scanned)
+            batch_ids = (
+                await session.scalars(
+                    select(Video.id)
+                    .where(*selected, Video.id > last_id)
+                    .order_by(Video.id)
+                    .limit(limit)
+                )
+            ).all()
+            if batch_ids:
+                # Rows changed since the scan are skipped by the status check.
+                batch_updated = await VideoService._transition_rows(
+                    session, target, allowed, Video.id.in_(batch_ids)
+                )
+                updated.extend(sorted(batch_updated))
+            if len(batch_ids) < limit:
+                return updated, False
+            scanned += len(batch_ids)
+            last_id = batch_ids[-1]
+
+        has_more = await session.scalar(
+            select(exists().where(*selected, Video.id > last_id))
+        )
+        await session.commit()
+        return updated, bool(has_more)
+
+    @staticmethod
+    async def _transition_rows(
+        session: AsyncSession,
+        target: VideoStatus,
+        allowed: Sequence[VideoStatus],
+        selection: ColumnElement[bool],
+    ) -> list[int]:
+        result = await session.execute(
+            update(Video)
+            .where(Video.status.in_(allowed), selection)
+            .values(
+                status=target,
+                version=Video.version + 1,
+                lease_token=None,
+                lease_expires_at=None,
+            )
+            .returning(*VIDEO_COLUMNS)
+            .execution_options(synchronize_session="fetch")
+        )
+        updated = result.mappings().all()
+        await session.commit()
+        await video_cache.invalidate(row["id"] for row in updated)
+        await VideoService.publish_events(session, "status", updated)
+        return [row["id"] for row in updated]
+
+    @staticmethod
+    async def publish_events(
+        session: AsyncSession, event_type: str, videos: Sequence[Any]
+    ) -> None:
+        """
+        Announce committed changes to event subscribers.
+
+        With the postgres backend one NOTIFY per batch reaches the listeners of
+        every worker, including this one; otherwise events are fanned out to
+        this process's subscribers directly.
+        """
+
+        if not videos:
+            return
+        events = [
+            VideoEvent(
+                type=event_type,
+                video=VideoResponse.model_validate(
+                    dict(video) if isinstance(video, RowMapping) else video
+                ).model_dump(mode="json"),
+            )
+            for video in videos
+        ]
+        if settings.events.backend == "postgres":
+            await session.execute(notify_statement(settings.events.channel, events))
+            await session.commit()
+        else:
+            event_broker.publish(events)
+
+    @staticmethod
+    async def existing_ids(session: AsyncSession, ids: Sequence[int]) -> set[int]:
+        """Return which of the ids belong to existing videos."""
+
+        result = await session.execute(select(Video.id).where(Video.id.in_(ids)))
+        return set(result.scalars())
+
+    @staticmethod
+    async def claim_videos(
+        session: AsyncSession, status: VideoStatus, limit: int, lease: timedelta
+    ) -> tuple[str, datetime, Sequence[Video]]:
+        """
+        Lease up to limit unclaimed videos in the given status, oldest first.
+
+        Videos whose lease has expired are claimable again, so a crashed
+        worker's batch returns to the pool. Rows locked by a concurrent claim
+        are skipped (FOR UPDATE SKIP LOCKED) rather than waited for; SQLite
+        renders no FOR UPDATE and instead serializes the single UPDATE
+        statement, which is atomic there as well.
+        """
+
+        now = datetime.now(timezone.utc)
+        lease_token = uuid.uuid4().hex
+        lease_expires_at = now + lease
+
+        candidates = (
+            select(Video.id)
+            .where(
+                Video.status == status,
+                or_(Video.lease_expires_at.is_(None), Video.lease_expires_at <= now),
+            )
+            .order_by(Video.start_time, Video.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.scalars(
+            update(Video)
+            .where(Video.id.in_(candidates.scalar_subquery()))
+            .values(lease_token=lease_token, lease_expires_at=lease_expires_at)
+            .returning(Video)
+            .execution_options(synchronize_session=False)
+        )
+        videos = sorted(result.all(), key=lambda video: (video.start_time, video.id))
+        await session.commit()
+        return lease_token, lease_expires_at, videos
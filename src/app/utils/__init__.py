@@ -1,3 +1,62 @@
-__all__ = ("FFProbeError", "probe_video")
+__all__ = (
+    "EventBroker",
+    "EventSubscription",
+    "FFProbeError",
+    "Interval",
+    "LRUCacheBackend",
+    "METRICS_CONTENT_TYPE",
+    "MetricsRegistry",
+    "ProbeCache",
+    "ProbeQueueFullError",
+    "ProbeResult",
+    "ProbeScheduler",
+    "QueryDebugger",
+    "RedisCacheBackend",
+    "SQLiteProbeCacheBackend",
+    "StatementLog",
+    "VideoCache",
+    "VideoEvent",
+    "decode_cursor",
+    "encode_cursor",
+    "etag_matches",
+    "event_broker",
+    "find_gaps",
+    "instrument_engine",
+    "listing_etag",
+    "listen_for_events",
+    "merge_intervals",
+    "metrics",
+    "notify_statement",
+    "probe_cache",
+    "probe_scheduler",
+    "probe_video",
+    "probe_video_async",
+    "track_queries",
+    "track_statements",
+    "video_cache",
+    "video_etag",
+)
 
-from .ffprobe import FFProbeError, probe_video
+from .cursor import decode_cursor, encode_cursor
+from .etag import etag_matches, listing_etag, video_etag
+from .events import (
+    EventBroker,
+    EventSubscription,
+    VideoEvent,
+    event_broker,
+    listen_for_events,
+    notify_statement,
+)
+from .ffprobe import FFProbeError, ProbeResult, probe_video, probe_video_async
+from .intervals import Interval, find_gaps, merge_intervals
+from .metrics import (
+    METRICS_CONTENT_TYPE,
+    MetricsRegistry,
+    instrument_engine,
+    metrics,
+    track_queries,
+)
+from .probe_cache import ProbeCache, SQLiteProbeCacheBackend, probe_cache
+from .probe_scheduler import ProbeQueueFullError, ProbeScheduler, probe_scheduler
+from .query_debug import QueryDebugger, StatementLog, track_statements
+from .video_cache import LRUCacheBackend, RedisCacheBackend, VideoCache, video_cache
@@ -0,0 +1,23 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(start_time: datetime, video_id: int) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+    """
+    raw = json.dumps([start_time.isoformat(), video_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor made by encode_cursor, raising ValueError if it is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        start_time, video_id = json.loads(raw)
+        return datetime.fromisoformat(start_time), int(video_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor.") from e
@@ -0,0 +1,34 @@
+import hashlib
+from collections.abc import Iterable
+
+
+def video_etag(video_id: int, version: int) -> str:
+    """Strong validator of one video; the version changes on every update."""
+
+    return f'"{video_id}-{version}"'
+
+
+def listing_etag(parts: Iterable[object]) -> str:
+    """Weak validator of a listing, a digest of the ids and versions of its rows."""
+
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches the ETag.
+
+    Uses the weak comparison required for If-None-Match, so W/ prefixes are
+    ignored on both sides.
+    """
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
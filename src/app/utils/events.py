@@ -0,0 +1,150 @@
+import asyncio
+import json
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic_core import to_json
+from sqlalchemy import ARRAY, Select, Text, bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core import get_logger, settings
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class VideoEvent:
+    type: str
+    video: dict[str, Any]
+
+    def to_json(self) -> str:
+        return to_json({"type": self.type, "video": self.video}).decode()
+
+    @classmethod
+    def from_json(cls, payload: str) -> "VideoEvent":
+        data = json.loads(payload)
+        return cls(type=data["type"], video=data["video"])
+
+
+class EventSubscription:
+    """
+    One subscriber's bounded queue of matching events.
+
+    A subscriber that falls a full queue behind is closed instead of slowing
+    down publishers; it is expected to reconnect and re-read the listing.
+    """
+
+    def __init__(
+        self,
+        camera_numbers: Sequence[int] | None,
+        statuses: Sequence[str] | None,
+        max_queue: int,
+    ):
+        self.camera_numbers = set(camera_numbers) if camera_numbers else None
+        self.statuses = set(statuses) if statuses else None
+        self.closed = False
+        self._queue: asyncio.Queue[VideoEvent] = asyncio.Queue(max_queue)
+
+    def matches(self, event: VideoEvent) -> bool:
+        if self.camera_numbers and (
+            event.video["camera_number"] not in self.camera_numbers
+        ):
+            return False
+        return not self.statuses or event.video["status"] in self.statuses
+
+    def offer(self, event: VideoEvent) -> bool:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.closed = True
+            return False
+        return True
+
+    async def get(self) -> VideoEvent | None:
+        """Next event, or None once the subscription has been closed."""
+
+        if self.closed:
+            return None
+        return await self._queue.get()
+
+
+class EventBroker:
+    """In-process fan-out of video events to filtered subscribers."""
+
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+        self._subscriptions: set[EventSubscription] = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        camera_numbers: Sequence[int] | None = None,
+        statuses: Sequence[str] | None = None,
+    ) -> EventSubscription:
+        subscription = EventSubscription(camera_numbers, statuses, self.max_queue)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def publish(self, events: Iterable[VideoEvent]) -> None:
+        events = list(events)
+        for subscription in list(self._subscriptions):
+            for event in events:
+                if subscription.matches(event) and not subscription.offer(event):
+                    logger.warning("Dropping an event subscriber that fell behind.")
+                    self.unsubscribe(subscription)
+                    break
+
+
+def notify_statement(channel: str, events: Sequence[VideoEvent]) -> Select:
+    """A single SELECT pg_notify(...) sending every event on the channel."""
+
+    payloads = func.unnest(
+        bindparam("payloads", [event.to_json() for event in events], type_=ARRAY(Text))
+    ).table_valued("payload")
+    return select(func.pg_notify(channel, payloads.c.payload)).select_from(payloads)
+
+
+async def listen_for_events(
+    engine: AsyncEngine,
+    channel: str,
+    broker: EventBroker,
+    reconnect_delay_s: float = 1.0,
+) -> None:
+    """
+    Relay PostgreSQL notifications on the channel into the broker.
+
+    Runs until cancelled, holding one connection with LISTEN and reconnecting
+    after the connection is lost.
+    """
+
+    def on_notification(_connection, _pid, _channel, payload: str) -> None:
+        broker.publish([VideoEvent.from_json(payload)])
+
+    while True:
+        try:
+            async with engine.connect() as connection:
+                raw = (await connection.get_raw_connection()).driver_connection
+                lost = asyncio.Event()
+                raw.add_termination_listener(lambda _connection: lost.set())
+                await raw.add_listener(channel, on_notification)
+                logger.info(f"Listening for video events on {channel}.")
+                try:
+                    await lost.wait()
+                finally:
+                    if not raw.is_closed():
+                        await raw.remove_listener(channel, on_notification)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Video event listener failed, reconnecting.")
+        await asyncio.sleep(reconnect_delay_s)
+
+
+event_broker = EventBroker(max_queue=settings.events.subscriber_queue)
@@ -1,8 +1,14 @@
+import asyncio
 import json
 import subprocess
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
+from .metrics import ffprobe_duration
+
 
 class FFProbeError(RuntimeError):
     pass
@@ -35,11 +41,8 @@ def _parse_creation_time(value: str) -> datetime | None:
     return dt
 
 
-def probe_video(path_or_url: str, timeout_s: float = 20.0) -> ProbeResult:
-    """
-    Extract duration and creation time via ffprobe.
-    """
-    cmd = [
+def _build_command(path_or_url: str) -> list[str]:
+    return [
         "ffprobe",
         "-v",
         "error",
@@ -50,23 +53,17 @@ def probe_video(path_or_url: str, timeout_s: float = 20.0) -> ProbeResult:
         path_or_url,
     ]
 
-    try:
-        proc = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout_s,
-            check=False,
-        )
-    except (OSError, subprocess.TimeoutExpired) as e:
-        raise FFProbeError(f"ffprobe failed to run: {e}") from e
 
-    if proc.returncode != 0:
-        stderr = (proc.stderr or "").strip()
-        raise FFProbeError(f"ffprobe returned {proc.returncode}: {stderr}")
+def _parse_output(returncode: int, stdout: str, stderr: str) -> ProbeResult:
+    """
+    Turns ffprobe's exit code and output into a ProbeResult.
+    """
+    if returncode != 0:
+        stderr = (stderr or "").strip()
+        raise FFProbeError(f"ffprobe returned {returncode}: {stderr}")
 
     try:
-        payload = json.loads(proc.stdout)
+        payload = json.loads(stdout)
     except json.JSONDecodeError as e:
         raise FFProbeError(f"ffprobe output is not valid JSON: {e}") from e
 
@@ -87,3 +84,72 @@ def probe_video(path_or_url: str, timeout_s: float = 20.0) -> ProbeResult:
         creation_time = _parse_creation_time(creation_time_raw)
 
     return ProbeResult(duration=duration, creation_time=creation_time)
+
+
+@contextmanager
+def _observe_duration() -> Iterator[None]:
+    """
+    Records the probe's run time, labelled with whether it succeeded.
+    """
+    started = time.perf_counter()
+    result = "error"
+    try:
+        yield
+        result = "ok"
+    finally:
+        ffprobe_duration.observe(time.perf_counter() - started, result=result)
+
+
+def probe_video(path_or_url: str, timeout_s: float = 20.0) -> ProbeResult:
+    """
+    Extract duration and creation time via ffprobe.
+    """
+    with _observe_duration():
+        try:
+            proc = subprocess.run(
+                _build_command(path_or_url),
+                capture_output=True,
+                text=True,
+                timeout=timeout_s,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise FFProbeError(f"ffprobe failed to run: {e}") from e
+
+        return _parse_output(proc.returncode, proc.stdout, proc.stderr)
+
+
+async def probe_video_async(path_or_url: str, timeout_s: float = 20.0) -> ProbeResult:
+    """
+    Extract duration and creation time via ffprobe without blocking the event loop.
+
+    The ffprobe process is killed if the timeout expires or the awaiting task is cancelled.
+    """
+    with _observe_duration():
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *_build_command(path_or_url),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            raise FFProbeError(f"ffprobe failed to run: {e}") from e
+
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(), timeout=timeout_s
+            )
+        except TimeoutError as e:
+            raise FFProbeError(
+                f"ffprobe failed to run: timed out after {timeout_s} seconds"
+            ) from e
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+
+        return _parse_output(
+            proc.returncode,
+            stdout.decode(errors="replace"),
+            stderr.decode(errors="replace"),
+        )
@@ -0,0 +1,43 @@
+from collections.abc import Iterable
+from datetime import datetime
+
+Interval = tuple[datetime, datetime]
+
+
+def merge_intervals(
+    intervals: Iterable[Interval],
+) -> tuple[list[Interval], list[Interval]]:
+    """
+    Merge intervals sorted by start into covered spans in a single sweep.
+
+    Returns the covered spans and the parts where an interval overlaps the
+    ones before it. Touching intervals are merged without an overlap.
+    """
+    covered: list[Interval] = []
+    overlaps: list[Interval] = []
+    for start, end in intervals:
+        if covered and start <= covered[-1][1]:
+            span_start, span_end = covered[-1]
+            if start < span_end:
+                overlaps.append((start, min(end, span_end)))
+            covered[-1] = (span_start, max(span_end, end))
+        else:
+            covered.append((start, end))
+    return covered, overlaps
+
+
+def find_gaps(
+    covered: Iterable[Interval], start: datetime, end: datetime
+) -> list[Interval]:
+    """
+    Return the parts of [start, end) not covered by the sorted spans.
+    """
+    gaps: list[Interval] = []
+    cursor = start
+    for span_start, span_end in covered:
+        if span_start > cursor:
+            gaps.append((cursor, span_start))
+        cursor = max(cursor, span_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
@@ -0,0 +1,297 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+class Metric:
+    """
+    A metric family with a fixed set of label names.
+
+    Values are kept per combination of label values and rendered in the
+    Prometheus text exposition format.
+    """
+
+    type: str
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}."
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape(self.help)}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines) + "\n"
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be increased.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+@dataclass
+class _HistogramValues:
+    counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[LabelValues, _HistogramValues] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            values = self._values.get(key)
+            if values is None:
+                values = self._values[key] = _HistogramValues(
+                    counts=[0] * len(self.buckets)
+                )
+            if index < len(self.buckets):
+                values.counts[index] += 1
+            values.sum += value
+            values.count += 1
+
+    def count(self, **labels: str) -> int:
+        values = self._values.get(self._key(labels))
+        return values.count if values else 0
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = [
+                (key, list(value.counts), value.sum, value.count)
+                for key, value in self._values.items()
+            ]
+        for key, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    (*self.labelnames, "le"), (*key, _format_value(bound))
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels((*self.labelnames, "le"), (*key, "+Inf"))
+            yield f"{self.name}_bucket{labels} {count}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template and status code.",
+    ("method", "route", "status"),
+)
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time to handle an HTTP request.",
+    ("method", "route"),
+)
+http_requests_in_progress = metrics.gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled.",
+    ("method",),
+)
+http_request_db_queries = metrics.histogram(
+    "http_request_db_queries",
+    "Database statements executed while handling an HTTP request.",
+    ("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
+http_request_db_duration = metrics.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing database statements while handling an HTTP request.",
+    ("method", "route"),
+)
+db_queries = metrics.counter("db_queries_total", "Database statements executed.")
+db_query_duration = metrics.histogram(
+    "db_query_duration_seconds",
+    "Time to execute one database statement.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+ffprobe_duration = metrics.histogram(
+    "ffprobe_duration_seconds",
+    "Time for one ffprobe run, by whether it succeeded.",
+    ("result",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0),
+)
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    duration_s: float = 0.0
+
+
+_request_queries: ContextVar[QueryStats | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count the statements the current task executes on instrumented engines."""
+
+    stats = QueryStats()
+    token = _request_queries.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_queries.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.metrics_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, "metrics_started_at", None)
+    if started_at is None:
+        return
+    elapsed = time.perf_counter() - started_at
+    db_queries.inc()
+    db_query_duration.observe(elapsed)
+
+    stats = _request_queries.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.duration_s += elapsed
+
+
+def instrument_engine(engine: Engine | AsyncEngine) -> None:
+    """Time every statement the engine executes; safe to call more than once."""
+
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
@@ -0,0 +1,234 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+from core import settings
+from .ffprobe import ProbeResult
+
+
+@dataclass(frozen=True)
+class ProbeCacheStats:
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class SQLiteProbeCacheBackend:
+    """
+    Persists probe results in a local SQLite file so they survive restarts.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS probe_cache ("
+            "key TEXT PRIMARY KEY, "
+            "duration_s REAL, "
+            "creation_time TEXT, "
+            "stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> tuple[ProbeResult, float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT duration_s, creation_time, stored_at "
+                "FROM probe_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        duration_s, creation_time, stored_at = row
+        result = ProbeResult(
+            duration=None if duration_s is None else timedelta(seconds=duration_s),
+            creation_time=(
+                None if creation_time is None else datetime.fromisoformat(creation_time)
+            ),
+        )
+        return result, stored_at
+
+    def set(self, key: str, result: ProbeResult, stored_at: float) -> None:
+        duration_s = (
+            None if result.duration is None else result.duration.total_seconds()
+        )
+        creation_time = (
+            None if result.creation_time is None else result.creation_time.isoformat()
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO probe_cache "
+                "(key, duration_s, creation_time, stored_at) VALUES (?, ?, ?, ?)",
+                (key, duration_s, creation_time, stored_at),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM probe_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM probe_cache")
+            self._conn.commit()
+
+
+class ProbeCache:
+    """
+    LRU cache of probe results with a TTL and an optional persistent backend.
+
+    Local files are keyed by path, size and mtime, so a rewritten file is probed
+    again. Remote sources are keyed by their URL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_s: float,
+        backend: SQLiteProbeCacheBackend | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.backend = backend
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[ProbeResult, float]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def key_for(path_or_url: str) -> str | None:
+        """
+        Build the cache key for a source, or None if it cannot be cached.
+        """
+        if urlsplit(path_or_url).scheme not in ("", "file"):
+            return f"url:{path_or_url}"
+
+        try:
+            stat = os.stat(path_or_url)
+        except OSError:
+            return None
+        return f"file:{path_or_url}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    @staticmethod
+    async def key_for_async(path_or_url: str) -> str | None:
+        """Like key_for, but a local file is stat'ed in a worker thread."""
+        if urlsplit(path_or_url).scheme not in ("", "file"):
+            return ProbeCache.key_for(path_or_url)
+        return await asyncio.to_thread(ProbeCache.key_for, path_or_url)
+
+    def get(self, key: str) -> ProbeResult | None:
+        now = self._clock()
+        result = self._get_local(key, now)
+        if result is not None:
+            return result
+        return self._get_backend(key, now)
+
+    async def get_async(self, key: str) -> ProbeResult | None:
+        """
+        Like get, but the persistent backend is read in a worker thread so the
+        event loop never waits on SQLite.
+        """
+        now = self._clock()
+        result = self._get_local(key, now)
+        if result is not None:
+            return result
+        if self.backend is None:
+            return self._get_backend(key, now)
+        return await asyncio.to_thread(self._get_backend, key, now)
+
+    def set(self, key: str, result: ProbeResult) -> None:
+        stored_at = self._clock()
+        with self._lock:
+            self._store(key, result, stored_at)
+        if self.backend is not None:
+            self.backend.set(key, result, stored_at)
+
+    async def set_async(self, key: str, result: ProbeResult) -> None:
+        """Like set, but the backend write and its commit run in a worker thread."""
+        stored_at = self._clock()
+        with self._lock:
+            self._store(key, result, stored_at)
+        if self.backend is not None:
+            await asyncio.to_thread(self.backend.set, key, result, stored_at)
+
+    def _get_local(self, key: str, now: float) -> ProbeResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            result, stored_at = entry
+            if now - stored_at <= self.ttl_s:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return result
+            del self._entries[key]
+            self._expirations += 1
+            return None
+
+    def _get_backend(self, key: str, now: float) -> ProbeResult | None:
+        entry = self.backend.get(key) if self.backend is not None else None
+        if entry is not None:
+            result, stored_at = entry
+            if now - stored_at <= self.ttl_s:
+                with self._lock:
+                    self._hits += 1
+                    self._store(key, result, stored_at)
+                return result
+            self.backend.delete(key)
+            with self._lock:
+                self._expirations += 1
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> ProbeCacheStats:
+        with self._lock:
+            return ProbeCacheStats(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def _store(self, key: str, result: ProbeResult, stored_at: float) -> None:
+        self._entries[key] = (result, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+
+probe_cache = ProbeCache(
+    max_entries=settings.probe.cache_max_entries,
+    ttl_s=settings.probe.cache_ttl_s,
+    backend=(
+        SQLiteProbeCacheBackend(settings.probe.cache_path)
+        if settings.probe.cache_path
+        else None
+    ),
+)
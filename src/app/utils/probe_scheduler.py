@@ -0,0 +1,96 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import ParamSpec, TypeVar
+
+from core import settings
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class ProbeQueueFullError(RuntimeError):
+    def __init__(self, retry_after_s: int):
+        super().__init__("Too many pending ffprobe runs, try again later.")
+        self.retry_after_s = retry_after_s
+
+
+@dataclass(frozen=True)
+class ProbeSchedulerStats:
+    max_concurrency: int
+    max_queue: int
+    running: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    avg_wait_s: float
+    max_wait_s: float
+
+
+class ProbeScheduler:
+    """
+    Limits how many probes run at once and how many may wait for a slot.
+
+    Calls beyond the wait queue fail fast with ProbeQueueFullError instead of
+    piling up more ffprobe processes.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, retry_after_s: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.retry_after_s = retry_after_s
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._running = 0
+        self._waiting = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total_s = 0.0
+        self._wait_max_s = 0.0
+
+    async def run(
+        self, probe: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Run the probe coroutine once a slot is free."""
+
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            self._rejected += 1
+            raise ProbeQueueFullError(self.retry_after_s)
+
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        waited = time.perf_counter() - queued_at
+        self._wait_total_s += waited
+        self._wait_max_s = max(self._wait_max_s, waited)
+        self._running += 1
+        try:
+            return await probe(*args, **kwargs)
+        finally:
+            self._running -= 1
+            self._completed += 1
+            self._semaphore.release()
+
+    def stats(self) -> ProbeSchedulerStats:
+        started = self._completed + self._running
+        return ProbeSchedulerStats(
+            max_concurrency=self.max_concurrency,
+            max_queue=self.max_queue,
+            running=self._running,
+            queue_depth=self._waiting,
+            completed=self._completed,
+            rejected=self._rejected,
+            avg_wait_s=self._wait_total_s / started if started else 0.0,
+            max_wait_s=self._wait_max_s,
+        )
+
+
+probe_scheduler = ProbeScheduler(
+    max_concurrency=settings.probe.max_concurrency,
+    max_queue=settings.probe.max_queue,
+    retry_after_s=settings.probe.retry_after_s,
+)
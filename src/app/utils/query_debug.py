@@ -0,0 +1,138 @@
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core import get_logger
+
+logger = get_logger(__name__)
+
+_EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+_SAVEPOINT = "query_debug_explain"
+
+
+@dataclass
+class StatementLog:
+    statements: list[str] = field(default_factory=list)
+    duration_s: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements run at least threshold times, most frequent first."""
+
+        return [
+            (statement, count)
+            for statement, count in Counter(self.statements).most_common()
+            if count >= threshold
+        ]
+
+
+_active_logs: ContextVar[tuple[StatementLog, ...]] = ContextVar(
+    "active_statement_logs", default=()
+)
+
+
+@contextmanager
+def track_statements() -> Iterator[StatementLog]:
+    """
+    Record the statements the current task runs on engines a QueryDebugger
+    instruments. Nested blocks each get every statement.
+    """
+
+    log = StatementLog()
+    token = _active_logs.set((*_active_logs.get(), log))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+
+
+class QueryDebugger:
+    """
+    Records statements into the active StatementLogs, and logs statements
+    slower than slow_ms with their EXPLAIN plan.
+    """
+
+    def __init__(self, slow_ms: float | None = None, explain: bool = True):
+        self.slow_s = slow_ms / 1000 if slow_ms is not None else None
+        self.explain = explain
+
+    def instrument(self, engine: Engine | AsyncEngine) -> None:
+        if isinstance(engine, AsyncEngine):
+            engine = engine.sync_engine
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def uninstrument(self, engine: Engine | AsyncEngine) -> None:
+        if isinstance(engine, AsyncEngine):
+            engine = engine.sync_engine
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        if context is not None:
+            context.debug_started_at = time.perf_counter()
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        started_at = getattr(context, "debug_started_at", None)
+        if started_at is None:
+            return
+        elapsed = time.perf_counter() - started_at
+        for log in _active_logs.get():
+            log.statements.append(statement)
+            log.duration_s += elapsed
+
+        if self.slow_s is None or elapsed < self.slow_s:
+            return
+        plan = ""
+        if self.explain and not executemany:
+            plan = "\n" + self._explain(conn, statement, parameters)
+        logger.warning(f"Slow query took {elapsed * 1000:.1f} ms: {statement}{plan}")
+
+    @staticmethod
+    def _explain(conn, statement: str, parameters) -> str:
+        if not statement.lstrip().lower().startswith(_EXPLAINABLE):
+            return "(no plan for this statement)"
+        explain = QueryDebugger._explain_sql(conn.dialect.name, statement)
+        # A raw cursor, so the EXPLAIN itself is neither recorded nor timed.
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            rows = QueryDebugger._run_in_savepoint(cursor, explain, parameters)
+        except Exception as e:
+            return f"(EXPLAIN failed: {e})"
+        finally:
+            cursor.close()
+        return "\n".join(" ".join(str(value) for value in row) for row in rows)
+
+    @staticmethod
+    def _explain_sql(dialect_name: str, statement: str) -> str:
+        prefix = "EXPLAIN QUERY PLAN" if dialect_name == "sqlite" else "EXPLAIN"
+        return f"{prefix} {statement}"
+
+    @staticmethod
+    def _run_in_savepoint(cursor, statement: str, parameters) -> list[tuple]:
+        """
+        Run the statement on the caller's connection inside a savepoint, so a
+        failure does not leave the caller's transaction aborted on PostgreSQL.
+        """
+
+        cursor.execute(f"SAVEPOINT {_SAVEPOINT}")
+        try:
+            cursor.execute(statement, parameters)
+            return cursor.fetchall()
+        except Exception:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {_SAVEPOINT}")
+            raise
+        finally:
+            cursor.execute(f"RELEASE SAVEPOINT {_SAVEPOINT}")
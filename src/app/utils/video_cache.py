@@ -0,0 +1,200 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from core import settings
+
+
+@dataclass(frozen=True)
+class VideoCacheStats:
+    hits: int
+    misses: int
+    coalesced: int
+    invalidations: int
+
+
+class VideoCacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl_s: float) -> None: ...
+
+    async def delete(self, keys: Iterable[str]) -> None: ...
+
+    async def clear(self) -> None: ...
+
+
+class LRUCacheBackend:
+    """In-process LRU of serialized videos, local to one worker."""
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_s: float) -> None:
+        self._entries[key] = (value, self._clock() + ttl_s)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """
+    Shares serialized videos between workers through a Redis-compatible client.
+
+    Any client with the redis.asyncio get/set/delete/scan_iter methods works.
+    """
+
+    def __init__(self, client: Any, prefix: str = "videos:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl_s: float) -> None:
+        await self.client.set(self.prefix + key, value, px=int(ttl_s * 1000))
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        keys = [self.prefix + key for key in keys]
+        if keys:
+            await self.client.delete(*keys)
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+
+
+class _LoadAbandoned(Exception):
+    """The caller running a shared load was cancelled before it finished."""
+
+
+def _fail(future: asyncio.Future, error: Exception) -> None:
+    future.set_exception(error)
+    # Mark the exception retrieved in case nobody else was waiting.
+    future.exception()
+
+
+class VideoCache:
+    """
+    Read-through cache of serialized videos keyed by id.
+
+    Concurrent misses for the same id share a single load. A load that races
+    with an invalidation of its id is returned to its callers but not stored,
+    so a write is never shadowed by the value read before it.
+    """
+
+    def __init__(self, backend: VideoCacheBackend, ttl_s: float):
+        self.backend = backend
+        self.ttl_s = ttl_s
+        self._pending: dict[int, asyncio.Future[bytes | None]] = {}
+        self._stale: set[int] = set()
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._invalidations = 0
+
+    async def get_or_load(
+        self, video_id: int, load: Callable[[], Awaitable[bytes | None]]
+    ) -> bytes | None:
+        """
+        Cached value for the id, loading it on a miss; None is not cached.
+
+        If the caller running a shared load is cancelled, the callers waiting
+        on it start over instead of being cancelled too: load uses the
+        session of the request that passed it, so it cannot outlive it.
+        """
+
+        while True:
+            cached = await self.backend.get(str(video_id))
+            if cached is not None:
+                self._hits += 1
+                return cached
+
+            pending = self._pending.get(video_id)
+            if pending is None:
+                return await self._load(video_id, load)
+
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except _LoadAbandoned:
+                continue
+
+    async def _load(
+        self, video_id: int, load: Callable[[], Awaitable[bytes | None]]
+    ) -> bytes | None:
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[video_id] = future
+        try:
+            value = await load()
+            if value is not None and video_id not in self._stale:
+                await self.backend.set(str(video_id), value, self.ttl_s)
+        except asyncio.CancelledError:
+            _fail(future, _LoadAbandoned())
+            raise
+        except Exception as e:
+            _fail(future, e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._pending[video_id]
+            self._stale.discard(video_id)
+
+    async def invalidate(self, video_ids: Iterable[int]) -> None:
+        video_ids = list(video_ids)
+        self._stale.update(
+            video_id for video_id in video_ids if video_id in self._pending
+        )
+        self._invalidations += len(video_ids)
+        await self.backend.delete(str(video_id) for video_id in video_ids)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> VideoCacheStats:
+        return VideoCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            coalesced=self._coalesced,
+            invalidations=self._invalidations,
+        )
+
+
+def _backend_from_settings() -> VideoCacheBackend:
+    if settings.video_cache.redis_url:
+        # Optional dependency, only needed when a shared cache is configured.
+        from redis.asyncio import Redis
+
+        return RedisCacheBackend(Redis.from_url(settings.video_cache.redis_url))
+    return LRUCacheBackend(max_entries=settings.video_cache.max_entries)
+
+
+video_cache = VideoCache(
+    backend=_backend_from_settings(), ttl_s=settings.video_cache.ttl_s
+)
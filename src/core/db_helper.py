@@ -1,26 +1,93 @@
+import asyncio
+import itertools
+import math
+import time
 from asyncio import current_task
+from collections.abc import Sequence
 from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
+from starlette.requests import Request
+from starlette.responses import Response
 
 from .config import settings
+from .pool import InstrumentedAsyncPool, PoolStats
+
+# Cookie holding the time until which a client's reads go to the primary.
+PRIMARY_UNTIL_COOKIE = "db_primary_until"
 
 
 class DBHelper:
-    def __init__(self, url: str, echo: bool = False):
-        self.engine = create_async_engine(url=url, echo=echo)
-        self.session_factory = async_sessionmaker(
-            bind=self.engine,
+    def __init__(
+        self,
+        url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        connect_args: dict | None = None,
+        replica_urls: Sequence[str] = (),
+        read_your_writes_s: float = 0.0,
+    ):
+        self.echo = echo
+        self.pool_options = dict(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            connect_args=connect_args or {},
+        )
+        self.engine = self._create_engine(url)
+        self.session_factory = self._create_session_factory(self.engine)
+
+        self.replica_engines = [self._create_engine(url) for url in replica_urls]
+        self.replica_session_factories = [
+            self._create_session_factory(engine) for engine in self.replica_engines
+        ]
+        self._replicas = itertools.cycle(self.replica_session_factories)
+        self.read_your_writes_s = read_your_writes_s
+
+    def _create_engine(self, url: str) -> AsyncEngine:
+        # SQLite engines pick their own pool and take none of these options.
+        if url.startswith("sqlite"):
+            return create_async_engine(url=url, echo=self.echo)
+        return create_async_engine(
+            url=url,
+            echo=self.echo,
+            poolclass=InstrumentedAsyncPool,
+            **self.pool_options,
+        )
+
+    @staticmethod
+    def _create_session_factory(
+        engine: AsyncEngine,
+    ) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            bind=engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
         )
 
+    async def dispose(self) -> None:
+        for engine in (self.engine, *self.replica_engines):
+            await engine.dispose()
+
+    def pool_stats(self) -> PoolStats | None:
+        """Usage of the connection pool, if it is instrumented."""
+
+        pool = self.engine.pool
+        return pool.stats() if isinstance(pool, InstrumentedAsyncPool) else None
+
     def get_scoped_session(self):
         return async_scoped_session(
             session_factory=self.session_factory,
@@ -28,19 +95,83 @@ class DBHelper:
         )
 
     async def session_dependency(self) -> AsyncGenerator[AsyncSession]:
-        async with self.session_factory() as session:
+        """
+        Request-scoped session, closed when the request finishes.
+
+        The close is shielded, so a request cancelled by a client disconnect
+        still returns its connection to the pool instead of leaving it for GC.
+        """
+
+        session = self.session_factory()
+        try:
+            yield session
+        finally:
+            await asyncio.shield(session.close())
+
+    async def read_session_dependency(
+        self, request: Request
+    ) -> AsyncGenerator[AsyncSession]:
+        """
+        Request-scoped session for read-only endpoints.
+
+        Sessions come from the replicas in turn, or from the primary when
+        there are none or the client wrote recently (see stick_to_primary).
+        """
+
+        session = self._read_session_factory(request)()
+        try:
             yield session
-            await session.close()
+        finally:
+            await asyncio.shield(session.close())
+
+    def _read_session_factory(
+        self, request: Request
+    ) -> async_sessionmaker[AsyncSession]:
+        if not self.replica_session_factories:
+            return self.session_factory
+        try:
+            primary_until = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+        except ValueError:
+            primary_until = 0
+        if primary_until > time.time():
+            return self.session_factory
+        return next(self._replicas)
+
+    def stick_to_primary(self, response: Response) -> None:
+        """
+        Route dependency of write endpoints: the client's reads go to the
+        primary for read_your_writes_s, until the replicas have its write.
+        """
+
+        if not self.replica_session_factories or self.read_your_writes_s <= 0:
+            return
+        response.set_cookie(
+            PRIMARY_UNTIL_COOKIE,
+            f"{time.time() + self.read_your_writes_s:.3f}",
+            max_age=math.ceil(self.read_your_writes_s),
+            httponly=True,
+            samesite="lax",
+        )
 
     async def scoped_session_dependency(
         self,
     ) -> AsyncGenerator[async_scoped_session[AsyncSession]]:
         session = self.get_scoped_session()
-        yield session
-        await session.remove()
+        try:
+            yield session
+        finally:
+            await asyncio.shield(session.remove())
 
 
 db_helper = DBHelper(
     url=settings.db.url,
     echo=settings.db.echo,
+    pool_size=settings.db.DB_POOL_SIZE,
+    max_overflow=settings.db.DB_MAX_OVERFLOW,
+    pool_timeout=settings.db.DB_POOL_TIMEOUT_S,
+    pool_recycle=settings.db.DB_POOL_RECYCLE_S,
+    pool_pre_ping=settings.db.DB_POOL_PRE_PING,
+    connect_args=settings.db.connect_args,
+    replica_urls=settings.db.DB_REPLICA_URLS,
+    read_your_writes_s=settings.db.DB_READ_YOUR_WRITES_S,
 )
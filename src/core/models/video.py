@@ -5,6 +5,7 @@ from sqlalchemy import (
     CheckConstraint,
     DateTime,
     Enum as SAEnum,
+    Index,
     Integer,
     String,
     Text,
@@ -37,6 +38,11 @@ class Video(Base):
         DurationType(),
         nullable=False,
     )
+    end_time: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        info={"description": "start_time + duration, maintained by the service layer"},
+    )
     camera_number: Mapped[int] = mapped_column(
         Integer,
         CheckConstraint("camera_number > 0", name="camera_number_positive"),
@@ -50,9 +56,54 @@ class Video(Base):
     status: Mapped[VideoStatus] = mapped_column(
         SAEnum(VideoStatus),
         default=VideoStatus.NEW,
-        server_default=VideoStatus.NEW.value,
+        server_default=VideoStatus.NEW.name,
         nullable=False,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default="1",
+        nullable=False,
+        info={"description": "Incremented on every update, used for ETags"},
+    )
+    lease_token: Mapped[str | None] = mapped_column(
+        String(32),
+        nullable=True,
+        info={"description": "Token of the worker that claimed the video"},
+    )
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        info={"description": "When the claim lapses and the video is claimable again"},
+    )
+
+
+Index(
+    "ix_videos_camera_number_start_time",
+    Video.camera_number,
+    Video.start_time.desc(),
+    Video.id.desc(),
+)
+Index(
+    "ix_videos_status_start_time",
+    Video.status,
+    Video.start_time.desc(),
+    Video.id.desc(),
+)
+Index(
+    "ix_videos_location_start_time",
+    Video.location,
+    Video.start_time.desc(),
+    Video.id.desc(),
+)
+Index("ix_videos_start_time", Video.start_time.desc(), Video.id.desc())
+Index("ix_videos_camera_number_duration", Video.camera_number, Video.duration)
+Index(
+    "ix_videos_camera_number_time_range",
+    Video.camera_number,
+    func.tstzrange(Video.start_time, Video.end_time),
+    postgresql_using="gist",
+).ddl_if(dialect="postgresql")
@@ -0,0 +1,75 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_s: float
+    max_wait_s: float
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long checkouts wait for a
+    connection, including the time to open a new one, and how many time out.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_total_s = 0.0
+        self._wait_max_s = 0.0
+
+    def recreate(self) -> "InstrumentedAsyncPool":
+        # Keep the counters when the engine replaces the pool (dispose()).
+        pool = super().recreate()
+        pool._checkouts = self._checkouts
+        pool._timeouts = self._timeouts
+        pool._wait_total_s = self._wait_total_s
+        pool._wait_max_s = self._wait_max_s
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+
+        waited = time.perf_counter() - started
+        with self._stats_lock:
+            self._checkouts += 1
+            self._wait_total_s += waited
+            self._wait_max_s = max(self._wait_max_s, waited)
+        return connection
+
+    def stats(self) -> PoolStats:
+        with self._stats_lock:
+            return PoolStats(
+                size=self.size(),
+                checked_in=self.checkedin(),
+                checked_out=self.checkedout(),
+                overflow=max(self.overflow(), 0),
+                max_overflow=self._max_overflow,
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                avg_wait_s=(
+                    self._wait_total_s / self._checkouts if self._checkouts else 0.0
+                ),
+                max_wait_s=self._wait_max_s,
+            )
@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import batched, islice
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.services import VideoService
+from app.utils import FFProbeError, ProbeResult, probe_cache, probe_video
+from core import db_helper, get_logger, settings, setup_logging
+
+setup_logging()
+logger = get_logger(__name__)
+
+DEFAULT_PATTERN = r"(?P<location>[^/]+)/camera[_-]?(?P<camera>\d+)/[^/]+$"
+DEFAULT_EXTENSIONS = (".mp4", ".mkv", ".mov", ".avi", ".ts")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Ingest a video archive directory or manifest into the database."
+    )
+    parser.add_argument("source", help="Archive root directory or manifest file.")
+    parser.add_argument(
+        "--manifest",
+        action="store_true",
+        help="Treat source as a manifest with one video path per line.",
+    )
+    parser.add_argument(
+        "--pattern",
+        action="append",
+        help=(
+            "Regex with 'camera' and optionally 'location' named groups, matched "
+            "against the path. May be repeated; the first match wins."
+        ),
+    )
+    parser.add_argument("--location", help="Location for paths without one.")
+    parser.add_argument(
+        "--extensions",
+        default=",".join(DEFAULT_EXTENSIONS),
+        help="Comma separated video file extensions to pick up in a directory.",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument(
+        "--checkpoint",
+        help="File that records progress; an existing one resumes the run.",
+    )
+    parser.add_argument(
+        "--mtime-fallback",
+        action="store_true",
+        help="Use the file mtime when ffprobe finds no creation_time.",
+    )
+    return parser.parse_args(argv)
+
+
+def iter_directory(root: str, extensions: tuple[str, ...]) -> Iterator[str]:
+    """Walk the tree in a stable order, so the checkpoint can resume it."""
+
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from iter_directory(entry.path, extensions)
+        elif entry.name.lower().endswith(extensions):
+            yield entry.path
+
+
+def iter_manifest(path: str) -> Iterator[str]:
+    with open(path, encoding="utf-8") as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def match_path(
+    path: str, patterns: list[re.Pattern[str]], default_location: str | None
+) -> tuple[int, str] | None:
+    """Derive camera number and location from the path."""
+
+    normalized = Path(path).as_posix()
+    for pattern in patterns:
+        match = pattern.search(normalized)
+        if match is None:
+            continue
+        groups = match.groupdict()
+        location = groups.get("location") or default_location
+        if groups.get("camera") and location:
+            return int(groups["camera"]), location
+    return None
+
+
+def probe_cached(path: str) -> ProbeResult:
+    key = probe_cache.key_for(path)
+    probe = probe_cache.get(key) if key is not None else None
+    if probe is None:
+        probe = probe_video(path, timeout_s=settings.probe.timeout_s)
+        if key is not None:
+            probe_cache.set(key, probe)
+    return probe
+
+
+def probe_row(
+    path: str,
+    patterns: list[re.Pattern[str]],
+    default_location: str | None,
+    mtime_fallback: bool,
+) -> dict[str, Any] | str:
+    """Build a videos row for the path, or return the reason it was skipped."""
+
+    matched = match_path(path, patterns, default_location)
+    if matched is None:
+        return "path does not match any pattern"
+    camera_number, location = matched
+
+    try:
+        probe = probe_cached(path)
+    except FFProbeError as e:
+        return str(e)
+
+    start_time = probe.creation_time
+    if start_time is None and mtime_fallback:
+        try:
+            start_time = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+        except OSError as e:
+            return str(e)
+
+    if probe.duration is None or probe.duration.total_seconds() <= 0:
+        return "unable to determine duration"
+    if start_time is None:
+        return "unable to determine start_time"
+
+    return {
+        "video_path": path,
+        "start_time": start_time,
+        "duration": probe.duration,
+        "camera_number": camera_number,
+        "location": location,
+    }
+
+
+def load_checkpoint(path: str | None, source: str) -> dict[str, Any]:
+    checkpoint = {"source": source, "consumed": 0, "inserted": 0, "skipped": 0}
+    if path is None or not os.path.exists(path):
+        return checkpoint
+
+    with open(path, encoding="utf-8") as f:
+        saved = json.load(f)
+    if saved.get("source") != source:
+        raise SystemExit(
+            f"Checkpoint {path} belongs to {saved.get('source')!r}, not {source!r}."
+        )
+    checkpoint.update(saved)
+    return checkpoint
+
+
+def save_checkpoint(path: str | None, checkpoint: dict[str, Any]) -> None:
+    if path is None:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+async def ingest(
+    args: argparse.Namespace, session_factory: async_sessionmaker[AsyncSession]
+) -> dict[str, Any]:
+    patterns = [re.compile(pattern) for pattern in args.pattern or [DEFAULT_PATTERN]]
+    extensions = tuple(
+        ext.strip().lower() for ext in args.extensions.split(",") if ext.strip()
+    )
+    source = os.path.abspath(args.source)
+    checkpoint = load_checkpoint(args.checkpoint, source)
+
+    paths = (
+        iter_manifest(source) if args.manifest else iter_directory(source, extensions)
+    )
+    paths = islice(paths, checkpoint["consumed"], None)
+    if checkpoint["consumed"]:
+        logger.info(f"Resuming after {checkpoint['consumed']} entries.")
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    processed = 0
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for batch in batched(paths, args.batch_size):
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool,
+                        probe_row,
+                        path,
+                        patterns,
+                        args.location,
+                        args.mtime_fallback,
+                    )
+                    for path in batch
+                )
+            )
+            rows = [row for row in results if isinstance(row, dict)]
+            for path, result in zip(batch, results):
+                if isinstance(result, str):
+                    logger.warning(f"Skipping {path}: {result}")
+
+            async with session_factory() as session:
+                await VideoService.insert_videos(rows, session)
+
+            processed += len(batch)
+            checkpoint["consumed"] += len(batch)
+            checkpoint["inserted"] += len(rows)
+            checkpoint["skipped"] += len(batch) - len(rows)
+            save_checkpoint(args.checkpoint, checkpoint)
+
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Consumed {checkpoint['consumed']} entries, inserted "
+                f"{checkpoint['inserted']}, skipped {checkpoint['skipped']} "
+                f"({processed / elapsed:.1f} files/s)."
+            )
+
+    return checkpoint
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    try:
+        return await ingest(args, db_helper.session_factory)
+    finally:
+        await db_helper.engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    checkpoint = asyncio.run(run(args))
+    logger.info(
+        f"Ingest finished: inserted {checkpoint['inserted']}, "
+        f"skipped {checkpoint['skipped']}."
+    )
+
+
+if __name__ == "__main__":
+    main()
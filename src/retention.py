@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.services import RetentionReport, RetentionService
+from core import db_helper, get_logger, settings, setup_logging
+from core.config import RetentionRule
+
+setup_logging()
+logger = get_logger(__name__)
+
+RULE_KEYS = {"location": "location", "camera": "camera_number", "days": "max_age_days"}
+
+
+def parse_rule(value: str) -> RetentionRule:
+    """Parse 'location=Gate A,camera=3,days=30' into a retention rule."""
+
+    fields = {}
+    for part in value.split(","):
+        key, sep, field_value = part.partition("=")
+        if not sep or key.strip() not in RULE_KEYS:
+            raise argparse.ArgumentTypeError(
+                f"Invalid rule part {part!r}, expected one of "
+                f"{', '.join(f'{key}=...' for key in RULE_KEYS)}."
+            )
+        fields[RULE_KEYS[key.strip()]] = field_value.strip()
+    if "max_age_days" not in fields:
+        raise argparse.ArgumentTypeError("A rule needs days=<max age in days>.")
+    return RetentionRule.model_validate(fields)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    retention = settings.retention
+    parser = argparse.ArgumentParser(
+        description="Delete (and optionally archive) expired videos in batches."
+    )
+    parser.add_argument(
+        "--max-age-days",
+        type=float,
+        default=retention.max_age_days,
+        help="Age after which videos no rule matches expire.",
+    )
+    parser.add_argument(
+        "--rule",
+        action="append",
+        type=parse_rule,
+        help=(
+            "Per location and/or camera max age, e.g. 'location=Gate A,days=90' or "
+            "'camera=3,days=7'. May be repeated; the most specific rule wins. "
+            "Defaults to RETENTION_RULES."
+        ),
+    )
+    parser.add_argument("--batch-size", type=int, default=retention.batch_size)
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=retention.pause_s,
+        help="Seconds to sleep between batches.",
+    )
+    parser.add_argument(
+        "--archive",
+        help="NDJSON file the deleted videos are appended to before deletion.",
+    )
+    parser.add_argument(
+        "--drop-partitions",
+        action="store_true",
+        default=retention.drop_partitions,
+        help="Drop whole expired partitions of a partitioned videos table.",
+    )
+    return parser.parse_args(argv)
+
+
+async def purge(
+    args: argparse.Namespace, session_factory: async_sessionmaker[AsyncSession]
+) -> RetentionReport:
+    retention = settings.retention.model_copy(
+        update=dict(
+            max_age_days=args.max_age_days,
+            rules=args.rule or settings.retention.rules,
+            batch_size=args.batch_size,
+            pause_s=args.pause,
+            drop_partitions=args.drop_partitions,
+        )
+    )
+    if not RetentionService.rules_from_settings(retention):
+        raise SystemExit("Nothing to purge: give --max-age-days or --rule.")
+    if retention.drop_partitions and (args.archive or retention.archive_dir):
+        logger.warning("Partitions are not dropped while archiving.")
+
+    async with session_factory() as session:
+        return await RetentionService.purge_with_settings(
+            session, retention, archive_path=args.archive
+        )
+
+
+async def run(args: argparse.Namespace) -> RetentionReport:
+    try:
+        return await purge(args, db_helper.session_factory)
+    finally:
+        await db_helper.engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    logger.info(
+        f"Retention finished: deleted {report.deleted} videos "
+        f"({report.rows_per_s:.1f} rows/s), archived {report.archived}, "
+        f"dropped {len(report.dropped_partitions)} partitions."
+    )
+
+
+if __name__ == "__main__":
+    main()
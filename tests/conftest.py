@@ -1,5 +1,6 @@
 import asyncio
-from typing import AsyncGenerator, Generator
+from contextlib import contextmanager
+from typing import AsyncGenerator, Callable, ContextManager, Generator
 
 import pytest
 from httpx import ASGITransport, AsyncClient
@@ -8,6 +9,13 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.pool import StaticPool
 
 from app.app import app
+from app.utils import (
+    QueryDebugger,
+    StatementLog,
+    probe_cache,
+    track_statements,
+    video_cache,
+)
 from core import Base
 from .utils import override_db_session
 
@@ -79,8 +87,43 @@ async def client(
     """Test client with overridden database session"""
 
     override_db_session(test_session)
+    probe_cache.clear()
+    await video_cache.clear()
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as async_client:
         yield async_client
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def query_debugger(test_engine) -> QueryDebugger:
+    """Statement recorder on the test engine"""
+
+    debugger = QueryDebugger()
+    debugger.instrument(test_engine)
+    return debugger
+
+
+@pytest.fixture
+def query_budget(
+    query_debugger,
+) -> Callable[[int], ContextManager[StatementLog]]:
+    """
+    Fail the test if the block runs more statements than the budget, e.g.
+
+        with query_budget(2):
+            await client.get("/videos")
+    """
+
+    @contextmanager
+    def budget(max_queries: int) -> Generator[StatementLog]:
+        with track_statements() as log:
+            yield log
+        if len(log) > max_queries:
+            statements = "\n".join(log.statements)
+            pytest.fail(
+                f"Ran {len(log)} queries, budget is {max_queries}:\n{statements}"
+            )
+
+    return budget
@@ -0,0 +1,51 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core import DBHelper
+from core.pool import InstrumentedAsyncPool
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_checkouts_and_timeouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert engine.pool.stats().checked_out == 1
+
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = engine.pool.stats()
+        assert (stats.checked_out, stats.checked_in) == (0, 1)
+        assert (stats.checkouts, stats.timeouts) == (1, 1)
+        assert stats.max_wait_s >= stats.avg_wait_s > 0
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_helper_keeps_default_pool(tmp_path):
+    helper = DBHelper(f"sqlite+aiosqlite:///{tmp_path / 'helper.db'}", pool_size=50)
+    try:
+        assert helper.pool_stats() is None
+    finally:
+        await helper.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint(client: AsyncClient):
+    response = await client.get("/db/pool/stats")
+
+    assert response.status_code == 200
+    assert response.json()["size"] == 5
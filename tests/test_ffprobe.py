@@ -0,0 +1,46 @@
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.utils import FFProbeError, probe_video_async
+
+
+def fake_command(script: str):
+    def build_command(_path_or_url: str) -> list[str]:
+        return [sys.executable, "-c", script]
+
+    return build_command
+
+
+@pytest.mark.asyncio
+async def test_probe_video_async_parses_output(monkeypatch):
+    script = (
+        "import json; print(json.dumps({'format': {'duration': '12.5', "
+        "'tags': {'creation_time': '2024-01-01T12:00:00.000000Z'}}}))"
+    )
+    monkeypatch.setattr("app.utils.ffprobe._build_command", fake_command(script))
+
+    result = await probe_video_async("/videos/clip.mp4")
+
+    assert result.duration == timedelta(seconds=12.5)
+    assert result.creation_time == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_probe_video_async_nonzero_exit(monkeypatch):
+    script = "import sys; sys.stderr.write('No such file'); sys.exit(1)"
+    monkeypatch.setattr("app.utils.ffprobe._build_command", fake_command(script))
+
+    with pytest.raises(FFProbeError, match="No such file"):
+        await probe_video_async("/videos/missing.mp4")
+
+
+@pytest.mark.asyncio
+async def test_probe_video_async_timeout(monkeypatch):
+    monkeypatch.setattr(
+        "app.utils.ffprobe._build_command", fake_command("import time; time.sleep(30)")
+    )
+
+    with pytest.raises(FFProbeError, match="timed out"):
+        await probe_video_async("/videos/slow.mp4", timeout_s=0.2)
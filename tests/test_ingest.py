@@ -0,0 +1,80 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import ingest
+from app.utils import probe_cache
+from app.utils.ffprobe import ProbeResult
+from core.models import Video
+
+
+def make_archive(root, files):
+    for name in files:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+
+
+def test_match_path_uses_first_matching_pattern():
+    patterns = [
+        re.compile(r"/cam(?P<camera>\d+)/"),
+        re.compile(ingest.DEFAULT_PATTERN),
+    ]
+
+    assert ingest.match_path("/srv/Lobby/cam3/a.mp4", patterns, "Default") == (
+        3,
+        "Default",
+    )
+    assert ingest.match_path("/srv/Gate A/camera_7/a.mp4", patterns, None) == (
+        7,
+        "Gate A",
+    )
+    assert ingest.match_path("/srv/unknown/a.mp4", patterns, None) is None
+
+
+@pytest.mark.asyncio
+async def test_ingest_directory_resumes_from_checkpoint(
+    tmp_path, test_engine, test_session, monkeypatch
+):
+    archive = tmp_path / "archive"
+    make_archive(
+        archive,
+        [
+            "Gate A/camera1/a.mp4",
+            "Gate A/camera1/b.mp4",
+            "Gate A/camera2/c.mkv",
+            "Lobby/camera3/d.mp4",
+            "Lobby/camera3/notes.txt",
+            "misc/e.mp4",
+        ],
+    )
+
+    def fake_probe(_path: str, **_kwargs):
+        return ProbeResult(
+            duration=timedelta(seconds=60),
+            creation_time=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+
+    monkeypatch.setattr("ingest.probe_video", fake_probe)
+    probe_cache.clear()
+    session_factory = async_sessionmaker(bind=test_engine, expire_on_commit=False)
+    checkpoint_path = str(tmp_path / "ingest.checkpoint")
+    args = ingest.parse_args(
+        [str(archive), "--batch-size", "2", "--checkpoint", checkpoint_path]
+    )
+
+    first = await ingest.ingest(args, session_factory)
+    assert (first["consumed"], first["inserted"], first["skipped"]) == (5, 4, 1)
+
+    second = await ingest.ingest(args, session_factory)
+    assert second["inserted"] == 4
+
+    count = await test_session.scalar(select(func.count()).select_from(Video))
+    assert count == 4
+    cameras = await test_session.scalars(
+        select(Video.camera_number).order_by(Video.video_path)
+    )
+    assert list(cameras) == [1, 1, 2, 3]
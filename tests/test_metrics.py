@@ -0,0 +1,71 @@
+import pytest
+from httpx import AsyncClient
+
+from app.utils import FFProbeError, MetricsRegistry, instrument_engine, probe_video
+from app.utils.metrics import (
+    ffprobe_duration,
+    http_request_db_queries,
+    http_requests,
+    http_requests_in_progress,
+)
+from .test_ffprobe import fake_command
+
+
+def test_render_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("path",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    requests.inc(path='/a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    assert registry.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="/a\\"b"} 1.0\n'
+        "# HELP latency_seconds Latency.\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{le="0.1"} 1\n'
+        'latency_seconds_bucket{le="1.0"} 2\n'
+        'latency_seconds_bucket{le="+Inf"} 3\n'
+        "latency_seconds_sum 5.55\n"
+        "latency_seconds_count 3\n"
+    )
+    with pytest.raises(ValueError):
+        requests.inc(route="/a")
+
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_by_route(client: AsyncClient, test_engine):
+    instrument_engine(test_engine)
+    route = dict(method="GET", route="/videos/{video_id}")
+    not_found = http_requests.value(status="404", **route)
+    lookups = http_request_db_queries.count(**route)
+
+    await client.get("/videos/12345")
+
+    assert http_requests.value(status="404", **route) == not_found + 1
+    assert http_request_db_queries.count(**route) == lookups + 1
+    assert http_requests_in_progress.value(method="GET") == 0
+
+    response = await client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_requests_total{method="GET",route="/videos/{video_id}",status="404"}'
+        in response.text
+    )
+    assert "# TYPE http_request_db_queries histogram" in response.text
+
+
+def test_ffprobe_runs_are_timed(monkeypatch):
+    failed = ffprobe_duration.count(result="error")
+    monkeypatch.setattr(
+        "app.utils.ffprobe._build_command", fake_command("import sys; sys.exit(1)")
+    )
+
+    with pytest.raises(FFProbeError):
+        probe_video("/videos/missing.mp4")
+
+    assert ffprobe_duration.count(result="error") == failed + 1
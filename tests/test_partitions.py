@@ -0,0 +1,35 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.services import PartitionService
+
+
+@pytest.mark.asyncio
+async def test_maintain_partitions_keeps_running_after_errors(monkeypatch):
+    calls = []
+
+    async def fake_ensure(_session, months_ahead):
+        calls.append(months_ahead)
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+        return 1
+
+    @asynccontextmanager
+    async def session_factory():
+        yield None
+
+    monkeypatch.setattr(PartitionService, "ensure_partitions", fake_ensure)
+    task = asyncio.create_task(
+        PartitionService.maintain_partitions(
+            session_factory, months_ahead=2, interval_s=0.001
+        )
+    )
+    while len(calls) < 3:
+        await asyncio.sleep(0.001)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert calls[:3] == [2, 2, 2]
@@ -0,0 +1,135 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from app.utils import ProbeCache, ProbeResult, SQLiteProbeCacheBackend
+
+RESULT = ProbeResult(
+    duration=timedelta(seconds=10),
+    creation_time=datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+)
+
+
+def test_key_tracks_file_size_and_mtime(tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"a")
+    first = ProbeCache.key_for(str(clip))
+
+    clip.write_bytes(b"ab")
+
+    assert first is not None
+    assert ProbeCache.key_for(str(clip)) != first
+    assert ProbeCache.key_for(str(tmp_path / "missing.mp4")) is None
+    assert ProbeCache.key_for("http://example.com/a.mp4") == (
+        "url:http://example.com/a.mp4"
+    )
+
+
+def test_lru_eviction_and_ttl():
+    now = [0.0]
+    cache = ProbeCache(max_entries=2, ttl_s=60, clock=lambda: now[0])
+    cache.set("a", RESULT)
+    cache.set("b", RESULT)
+    assert cache.get("a") == RESULT
+    cache.set("c", RESULT)
+
+    assert cache.get("b") is None
+
+    cache.set("d", RESULT)
+    now[0] = 61.0
+    assert cache.get("d") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.expirations) == (
+        1,
+        2,
+        2,
+        1,
+    )
+
+
+def test_sqlite_backend_survives_restart(tmp_path):
+    path = str(tmp_path / "probe_cache.sqlite3")
+    ProbeCache(max_entries=10, ttl_s=60, backend=SQLiteProbeCacheBackend(path)).set(
+        "a", RESULT
+    )
+
+    restarted = ProbeCache(
+        max_entries=10, ttl_s=60, backend=SQLiteProbeCacheBackend(path)
+    )
+
+    assert restarted.get("a") == RESULT
+    assert restarted.stats().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_async_key_stats_files_off_the_event_loop(tmp_path, monkeypatch):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"a")
+    mtime_ns = clip.stat().st_mtime_ns
+    threads = []
+
+    def record(path, *args, stat=os.stat, **kwargs):
+        if path == str(clip):
+            threads.append(threading.get_ident())
+        return stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", record)
+
+    assert await ProbeCache.key_for_async(str(clip)) == f"file:{clip}:1:{mtime_ns}"
+    assert await ProbeCache.key_for_async("http://example.com/a.mp4") == (
+        "url:http://example.com/a.mp4"
+    )
+
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_async_api_keeps_sqlite_off_the_event_loop(tmp_path, monkeypatch):
+    backend = SQLiteProbeCacheBackend(str(tmp_path / "probe_cache.sqlite3"))
+    threads = []
+    for name in ("get", "set"):
+        method = getattr(backend, name)
+
+        def record(*args, method=method):
+            threads.append(threading.get_ident())
+            return method(*args)
+
+        monkeypatch.setattr(backend, name, record)
+
+    await ProbeCache(max_entries=10, ttl_s=60, backend=backend).set_async("a", RESULT)
+    restarted = ProbeCache(max_entries=10, ttl_s=60, backend=backend)
+    assert await restarted.get_async("a") == RESULT
+    assert await restarted.get_async("a") == RESULT
+
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_create_video_reuses_cached_probe(client: AsyncClient, monkeypatch):
+    calls = 0
+
+    async def fake_probe(_path: str, **_kwargs):
+        nonlocal calls
+        calls += 1
+        return RESULT
+
+    monkeypatch.setattr("app.services.video.probe_video_async", fake_probe)
+
+    payload = {
+        "video_path": "http://example.com/cached.mp4",
+        "camera_number": 1,
+        "location": "Net",
+    }
+    for _ in range(2):
+        response = await client.post("/videos", json=payload)
+        assert response.status_code == 201
+
+    assert calls == 1
+    stats = (await client.get("/probe/cache/stats")).json()
+    assert stats["hits"] == 1
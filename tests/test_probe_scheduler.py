@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.utils import ProbeQueueFullError, ProbeScheduler
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_concurrency_and_rejects_when_full():
+    scheduler = ProbeScheduler(max_concurrency=2, max_queue=1, retry_after_s=7)
+    release = asyncio.Event()
+    running = 0
+    peak = 0
+
+    async def slow_probe(_path: str):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+        return _path
+
+    tasks = [
+        asyncio.create_task(scheduler.run(slow_probe, f"/v/{i}")) for i in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    stats = scheduler.stats()
+    assert stats.running == 2
+    assert stats.queue_depth == 1
+
+    with pytest.raises(ProbeQueueFullError) as exc_info:
+        await scheduler.run(slow_probe, "/v/rejected")
+    assert exc_info.value.retry_after_s == 7
+
+    release.set()
+    assert await asyncio.gather(*tasks) == ["/v/0", "/v/1", "/v/2"]
+    assert peak == 2
+
+    stats = scheduler.stats()
+    assert stats.completed == 3
+    assert stats.rejected == 1
+    assert stats.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_create_video_returns_503_when_probe_queue_full(
+    client: AsyncClient, monkeypatch
+):
+    scheduler = ProbeScheduler(max_concurrency=1, max_queue=0, retry_after_s=3)
+    monkeypatch.setattr("app.services.video.probe_scheduler", scheduler)
+    await scheduler._semaphore.acquire()
+
+    payload = {
+        "video_path": "/videos/camera1/clip1.mp4",
+        "camera_number": 1,
+        "location": "Gate A",
+    }
+    response = await client.post("/videos", json=payload)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+    stats = await client.get("/probe/stats")
+    assert stats.status_code == 200
+    assert set(stats.json()) >= {"queue_depth", "running", "avg_wait_s"}
@@ -0,0 +1,119 @@
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.middleware import QueryBudgetMiddleware
+from app.utils import QueryDebugger, track_statements
+from .utils import create_video
+
+
+@pytest.mark.asyncio
+async def test_route_query_budgets(client: AsyncClient, query_budget):
+    video_id = await create_video(client)
+
+    with query_budget(2):
+        await client.get("/videos")
+    with query_budget(1):
+        await client.get(f"/videos/{video_id}")
+    with query_budget(1):
+        await client.post("/videos/batch-get", json={"ids": [video_id, 12345]})
+
+
+@pytest.mark.asyncio
+async def test_budget_fails_on_regression(test_session, query_budget):
+    with pytest.raises(pytest.fail.Exception, match="Ran 3 queries, budget is 2"):
+        with query_budget(2):
+            for _ in range(3):
+                await test_session.execute(text("SELECT 1"))
+
+
+@pytest.mark.asyncio
+async def test_slow_statements_are_logged_with_plan(test_engine, caplog):
+    debugger = QueryDebugger(slow_ms=0)
+    debugger.instrument(test_engine)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.utils.query_debug"):
+            async with test_engine.connect() as connection:
+                await connection.execute(text("SELECT id FROM videos WHERE id = 1"))
+    finally:
+        debugger.uninstrument(test_engine)
+
+    [record] = caplog.records
+    assert "Slow query" in record.message
+    assert "SELECT id FROM videos WHERE id = 1" in record.message
+    assert "SEARCH videos" in record.message
+
+
+@pytest.mark.asyncio
+async def test_failed_explain_leaves_the_transaction_usable(
+    test_engine, caplog, monkeypatch
+):
+    monkeypatch.setattr(
+        QueryDebugger,
+        "_explain_sql",
+        staticmethod(lambda dialect_name, statement: "EXPLAIN SELECT * FROM nowhere"),
+    )
+    debugger = QueryDebugger(slow_ms=0)
+    debugger.instrument(test_engine)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.utils.query_debug"):
+            async with test_engine.connect() as connection:
+                await connection.execute(text("CREATE TEMP TABLE explained (id INT)"))
+                await connection.execute(text("INSERT INTO explained VALUES (1)"))
+                rows = await connection.execute(text("SELECT id FROM explained"))
+                assert rows.scalars().all() == [1]
+                assert connection.in_transaction()
+                await connection.rollback()
+    finally:
+        debugger.uninstrument(test_engine)
+
+    assert sum("EXPLAIN failed" in record.message for record in caplog.records) == 2
+
+
+class AbortingCursor:
+    """Cursor that, like PostgreSQL, refuses statements after an error until a rollback."""
+
+    def __init__(self):
+        self.aborted = False
+
+    def execute(self, statement, parameters=None):
+        if statement.startswith("ROLLBACK"):
+            self.aborted = False
+        elif self.aborted:
+            raise RuntimeError("current transaction is aborted")
+        elif "nowhere" in statement:
+            self.aborted = True
+            raise RuntimeError('relation "nowhere" does not exist')
+
+    def fetchall(self):
+        return []
+
+
+def test_failed_explain_is_rolled_back_to_its_savepoint():
+    cursor = AbortingCursor()
+
+    with pytest.raises(RuntimeError, match="nowhere"):
+        QueryDebugger._run_in_savepoint(cursor, "EXPLAIN SELECT * FROM nowhere", None)
+
+    assert not cursor.aborted
+    cursor.execute("SELECT 1")
+
+
+@pytest.mark.asyncio
+async def test_requests_over_budget_are_logged(test_session, query_debugger, caplog):
+    async def app(scope, receive, send):
+        for _ in range(3):
+            await test_session.execute(text("SELECT 1"))
+
+    middleware = QueryBudgetMiddleware(app, max_queries=2, repeat_threshold=3)
+    scope = {"type": "http", "method": "GET", "path": "/videos"}
+    with caplog.at_level(logging.WARNING, logger="app.middleware"):
+        with track_statements() as log:
+            await middleware(scope, None, None)
+
+    assert len(log) == 3
+    [record] = caplog.records
+    assert "GET /videos ran 3 queries (budget 2)" in record.message
+    assert "3 x SELECT 1" in record.message
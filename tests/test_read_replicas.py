@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.app import app
+from app.services import VideoService
+from app.utils import video_cache
+from core import Base, DBHelper, db_helper
+from core.db_helper import PRIMARY_UNTIL_COOKIE
+
+PAYLOAD = {
+    "video_path": "/videos/camera1/clip.mp4",
+    "start_time": "2024-01-01T00:00:00Z",
+    "duration": 60,
+    "camera_number": 1,
+    "location": "Gate A",
+}
+
+
+async def make_helper(tmp_path, read_your_writes_s: float) -> DBHelper:
+    """A DBHelper over two SQLite files standing in for a primary and a replica."""
+
+    helper = DBHelper(
+        f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}",
+        replica_urls=[f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"],
+        read_your_writes_s=read_your_writes_s,
+    )
+    for engine in (helper.engine, *helper.replica_engines):
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    # A row only the replica has tells which database served a read.
+    async with helper.replica_session_factories[0]() as session:
+        await VideoService.insert_videos(
+            [
+                {
+                    "video_path": "/videos/replica.mp4",
+                    "start_time": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                    "duration": timedelta(seconds=60),
+                    "camera_number": 1,
+                    "location": "Gate A",
+                }
+            ],
+            session,
+        )
+    return helper
+
+
+@pytest.fixture
+async def replica_client(request, tmp_path):
+    helper = await make_helper(tmp_path, getattr(request, "param", 5.0))
+    for dependency in (
+        "session_dependency",
+        "read_session_dependency",
+        "stick_to_primary",
+    ):
+        app.dependency_overrides[getattr(db_helper, dependency)] = getattr(
+            helper, dependency
+        )
+    await video_cache.clear()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+    app.dependency_overrides.clear()
+    await helper.dispose()
+
+
+async def listed_paths(client: AsyncClient) -> list[str]:
+    response = await client.get("/videos")
+    return [video["video_path"] for video in response.json()["items"]]
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica(replica_client):
+    assert await listed_paths(replica_client) == ["/videos/replica.mp4"]
+    assert (await replica_client.get("/videos/stats")).json()["items"][0]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_stick_to_primary_after_own_write(replica_client):
+    response = await replica_client.post("/videos", json=PAYLOAD)
+    assert response.status_code == 201
+    assert PRIMARY_UNTIL_COOKIE in response.cookies
+
+    assert await listed_paths(replica_client) == [PAYLOAD["video_path"]]
+
+    replica_client.cookies.clear()
+    assert await listed_paths(replica_client) == ["/videos/replica.mp4"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("replica_client", [0], indirect=True)
+async def test_stickiness_can_be_turned_off(replica_client):
+    response = await replica_client.post("/videos", json=PAYLOAD)
+    assert PRIMARY_UNTIL_COOKIE not in response.cookies
+    assert await listed_paths(replica_client) == ["/videos/replica.mp4"]
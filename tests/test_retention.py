@@ -0,0 +1,131 @@
+import argparse
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import retention
+from app.services import RetentionService, VideoService
+from core.config import RetentionRule
+from core.models import Video
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+async def insert_videos(session, videos, now=NOW):
+    await VideoService.insert_videos(
+        [
+            {
+                "video_path": f"/videos/{location}/camera{camera}/{age}.mp4",
+                "start_time": now - timedelta(days=age),
+                "duration": timedelta(seconds=60),
+                "camera_number": camera,
+                "location": location,
+            }
+            for location, camera, age in videos
+        ],
+        session,
+    )
+
+
+async def remaining(session):
+    result = await session.execute(
+        select(Video.location, Video.camera_number, Video.start_time).order_by(
+            Video.location, Video.camera_number, Video.start_time
+        )
+    )
+    return [
+        (location, camera, (NOW.replace(tzinfo=None) - start_time).days)
+        for location, camera, start_time in result.all()
+    ]
+
+
+def test_parse_rule():
+    assert retention.parse_rule("location=Gate A,camera=3,days=7") == RetentionRule(
+        location="Gate A", camera_number=3, max_age_days=7
+    )
+    with pytest.raises(argparse.ArgumentTypeError):
+        retention.parse_rule("location=Gate A")
+    with pytest.raises(argparse.ArgumentTypeError):
+        retention.parse_rule("site=Gate A,days=7")
+
+
+@pytest.mark.asyncio
+async def test_purge_applies_most_specific_rule_in_batches(test_session, tmp_path):
+    await insert_videos(
+        test_session,
+        [
+            ("Gate A", 1, 5),
+            ("Gate A", 1, 40),
+            ("Gate A", 2, 3),
+            ("Gate A", 2, 10),
+            ("Lobby", 3, 40),
+            ("Lobby", 3, 100),
+            ("Lobby", 3, 400),
+        ],
+    )
+    rules = [
+        RetentionRule(location="Gate A", max_age_days=30),
+        RetentionRule(location="Gate A", camera_number=2, max_age_days=7),
+        RetentionRule(max_age_days=365),
+    ]
+
+    with open(tmp_path / "archive.ndjson", "wb") as archive:
+        report = await RetentionService.purge(
+            test_session, rules, batch_size=1, archive=archive, now=NOW
+        )
+
+    assert (report.deleted, report.archived) == (3, 3)
+    assert await remaining(test_session) == [
+        ("Gate A", 1, 5),
+        ("Gate A", 2, 3),
+        ("Lobby", 3, 100),
+        ("Lobby", 3, 40),
+    ]
+    archived = [
+        json.loads(line)
+        for line in (tmp_path / "archive.ndjson").read_text().splitlines()
+    ]
+    assert sorted(video["camera_number"] for video in archived) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_cli_purge(test_engine, test_session):
+    await insert_videos(
+        test_session,
+        [("Gate A", 1, 1), ("Gate A", 1, 1000)],
+        now=datetime.now(timezone.utc),
+    )
+    session_factory = async_sessionmaker(bind=test_engine, expire_on_commit=False)
+
+    args = retention.parse_args(["--max-age-days", "365", "--batch-size", "10"])
+    report = await retention.purge(args, session_factory)
+
+    assert report.deleted == 1
+    assert len(await remaining(test_session)) == 1
+
+
+@pytest.mark.asyncio
+async def test_cli_purge_archives_only_when_rows_expire(
+    test_engine, test_session, tmp_path
+):
+    await insert_videos(
+        test_session, [("Gate A", 1, 1000)], now=datetime.now(timezone.utc)
+    )
+    session_factory = async_sessionmaker(bind=test_engine, expire_on_commit=False)
+    archive = tmp_path / "expired.ndjson"
+    args = retention.parse_args(["--max-age-days", "365", "--archive", str(archive)])
+
+    report = await retention.purge(args, session_factory)
+    assert report.archived == 1
+    assert len(archive.read_text().splitlines()) == 1
+
+    report = await retention.purge(args, session_factory)
+    assert report.archived == 0
+    assert len(archive.read_text().splitlines()) == 1
+
+    args.archive = str(tmp_path / "empty.ndjson")
+    await retention.purge(args, session_factory)
+    assert not (tmp_path / "empty.ndjson").exists()
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.app import app
+from app.utils import video_cache
+from core import Base, DBHelper, db_helper
+
+REQUESTS = 2000
+
+
+@pytest.fixture
+async def soak_helper(tmp_path):
+    """A DBHelper over a file database with a real, small connection pool."""
+
+    helper = DBHelper(f"sqlite+aiosqlite:///{tmp_path / 'soak.db'}")
+    async with helper.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    app.dependency_overrides[db_helper.session_dependency] = helper.session_dependency
+    app.dependency_overrides[db_helper.read_session_dependency] = (
+        helper.read_session_dependency
+    )
+    await video_cache.clear()
+    yield helper
+
+    app.dependency_overrides.clear()
+    await helper.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_connections_return_to_pool_under_concurrent_load(soak_helper):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {
+            "video_path": "/videos/camera1/clip.mp4",
+            "start_time": "2024-01-01T00:00:00Z",
+            "duration": 60,
+            "camera_number": 1,
+            "location": "Gate A",
+        }
+        video_id = (await client.post("/videos", json=payload)).json()["id"]
+
+        # Listings, lookups that raise 404, and requests cancelled mid-flight.
+        paths = ["/videos", f"/videos/{video_id + 1}", "/videos/stats"]
+        tasks = [
+            asyncio.create_task(client.get(paths[index % len(paths)]))
+            for index in range(REQUESTS)
+        ]
+        await asyncio.sleep(0.01)
+        cancelled = set(range(0, REQUESTS, 7))
+        for index in cancelled:
+            tasks[index].cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for index, result in enumerate(results):
+        if index in cancelled and isinstance(result, asyncio.CancelledError):
+            continue
+        assert not isinstance(result, BaseException), f"request {index}: {result!r}"
+        assert result.status_code in (200, 404), f"request {index}: {result.text}"
+
+    # Shielded closes of cancelled requests may still be finishing.
+    for _ in range(100):
+        if soak_helper.engine.pool.checkedout() == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert soak_helper.engine.pool.checkedout() == 0
@@ -18,6 +18,7 @@ async def test_create_and_get_video(client: AsyncClient):
 
     assert created["status"] == "new"
     assert created["video_path"] == payload["video_path"]
+    assert created["end_time"].startswith("2024-01-01T00:02:00")
 
     fetched = await client.get(f"/videos/{created['id']}")
     assert fetched.status_code == 200
@@ -32,13 +33,13 @@ async def test_create_video_without_start_time_and_duration_uses_ffprobe(
 
     from app.utils.ffprobe import ProbeResult
 
-    def fake_probe(_path: str):
+    async def fake_probe(_path: str, **_kwargs):
         return ProbeResult(
             duration=timedelta(seconds=10),
             creation_time=datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
         )
 
-    monkeypatch.setattr("app.services.video.probe_video", fake_probe)
+    monkeypatch.setattr("app.services.video.probe_video_async", fake_probe)
 
     payload = {
         "video_path": "http://example.com/video.mp4",
@@ -92,15 +93,15 @@ async def test_filters_and_status_update(client: AsyncClient):
 
     status_filtered = await client.get("/videos", params={"status": ["recognized"]})
     assert status_filtered.status_code == 200
-    assert len(status_filtered.json()) == 1
-    assert status_filtered.json()[0]["id"] == created2["id"]
+    assert len(status_filtered.json()["items"]) == 1
+    assert status_filtered.json()["items"][0]["id"] == created2["id"]
 
     camera_filtered = await client.get(
         "/videos", params={"camera_number": [created1["camera_number"]]}
     )
     assert camera_filtered.status_code == 200
-    assert len(camera_filtered.json()) == 1
-    assert camera_filtered.json()[0]["id"] == created1["id"]
+    assert len(camera_filtered.json()["items"]) == 1
+    assert camera_filtered.json()["items"][0]["id"] == created1["id"]
 
     time_filtered = await client.get(
         "/videos",
@@ -110,11 +111,56 @@ async def test_filters_and_status_update(client: AsyncClient):
         },
     )
     assert time_filtered.status_code == 200
-    assert len(time_filtered.json()) == 1
-    assert time_filtered.json()[0]["id"] == created2["id"]
+    assert len(time_filtered.json()["items"]) == 1
+    assert time_filtered.json()["items"][0]["id"] == created2["id"]
 
 
 @pytest.mark.asyncio
 async def test_not_found_status_update(client: AsyncClient):
     response = await client.patch("/videos/999/status", json={"status": "transcoded"})
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_videos_keyset_pagination(client: AsyncClient):
+    for idx in range(5):
+        payload = {
+            "video_path": f"/videos/camera1/clip{idx}.mp4",
+            "start_time": f"2024-01-01T0{idx // 2}:00:00Z",
+            "duration": 60,
+            "camera_number": 1,
+            "location": "Gate A",
+        }
+        assert (await client.post("/videos", json=payload)).status_code == 201
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = (await client.get("/videos", params=params)).json()
+        seen.extend(item["video_path"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"/videos/camera1/clip{idx}.mp4" for idx in (4, 3, 2, 1, 0)]
+
+    response = await client.get("/videos", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_videos_matches_video_response_encoding(client: AsyncClient):
+    payload = {
+        "video_path": "/videos/camera1/clip1.mp4",
+        "start_time": "2024-01-01T00:00:00.250000Z",
+        "duration": 12.5,
+        "camera_number": 1,
+        "location": "Gate A",
+    }
+    created = (await client.post("/videos", json=payload)).json()
+
+    listed = (await client.get("/videos")).json()
+    fetched = (await client.get(f"/videos/{created['id']}")).json()
+
+    assert listed["items"] == [fetched]
@@ -0,0 +1,28 @@
+import pytest
+from httpx import AsyncClient
+
+from app.services import video as video_service
+from .utils import create_videos
+
+
+@pytest.mark.asyncio
+async def test_batch_get_keeps_order_and_reports_missing(
+    client: AsyncClient, monkeypatch
+):
+    monkeypatch.setattr(video_service, "BATCH_GET_CHUNK_SIZE", 2)
+    first, second, third = await create_videos(client, 3)
+
+    response = await client.post(
+        "/videos/batch-get", json={"ids": [third, 999, first, third, second]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [video["id"] for video in body["items"]] == [third, first, second]
+    assert body["missing"] == [999]
+    assert body["items"][0] == (await client.get(f"/videos/{third}")).json()
+
+
+@pytest.mark.asyncio
+async def test_batch_get_validates_ids(client: AsyncClient):
+    assert (await client.post("/videos/batch-get", json={"ids": []})).status_code == 422
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from app.utils.ffprobe import FFProbeError, ProbeResult
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_per_item_results(client: AsyncClient, monkeypatch):
+    async def fake_probe(path: str, **_kwargs):
+        if path.endswith("broken.mp4"):
+            raise FFProbeError("moov atom not found")
+        return ProbeResult(
+            duration=timedelta(seconds=30),
+            creation_time=datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+        )
+
+    monkeypatch.setattr("app.services.video.probe_video_async", fake_probe)
+
+    items = [
+        {
+            "video_path": f"/videos/camera1/clip{idx}.mp4",
+            "start_time": "2024-01-01T00:00:00Z",
+            "duration": 60,
+            "camera_number": 1,
+            "location": "Gate A",
+        }
+        for idx in range(3)
+    ]
+    items.append(
+        {
+            "video_path": "http://example.com/probed.mp4",
+            "camera_number": 2,
+            "location": "Net",
+        }
+    )
+    items.append(
+        {
+            "video_path": "http://example.com/broken.mp4",
+            "camera_number": 2,
+            "location": "Net",
+        }
+    )
+    items.append({"video_path": "", "camera_number": 0, "location": "Net"})
+
+    response = await client.post("/videos/bulk", json=items)
+    assert response.status_code == 200
+    body = response.json()
+
+    assert (body["created"], body["failed"]) == (4, 2)
+    assert [item["index"] for item in body["items"]] == list(range(6))
+    assert [item["video"]["video_path"] for item in body["items"][:4]] == [
+        item["video_path"] for item in items[:4]
+    ]
+    assert body["items"][3]["video"]["duration"] == "PT30S"
+    assert "moov atom not found" in body["items"][4]["error"]
+    assert "camera_number" in body["items"][5]["error"]
+
+    listed = await client.get("/videos")
+    assert len(listed.json()["items"]) == 4
+
+    fetched = await client.get(f"/videos/{body['items'][0]['video']['id']}")
+    assert fetched.status_code == 200
+    assert fetched.json()["status"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rejects_empty_batch(client: AsyncClient):
+    response = await client.post("/videos/bulk", json=[])
+    assert response.status_code == 422
@@ -0,0 +1,152 @@
+import asyncio
+import fnmatch
+
+import pytest
+from httpx import AsyncClient
+
+from app.utils import LRUCacheBackend, RedisCacheBackend, VideoCache, video_cache
+from .utils import create_video
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis.asyncio client methods the cache uses."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+        self.ttls[key] = px
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+
+@pytest.mark.asyncio
+async def test_lru_backend_evicts_and_expires():
+    now = [0.0]
+    backend = LRUCacheBackend(max_entries=2, clock=lambda: now[0])
+    await backend.set("1", b"one", ttl_s=10)
+    await backend.set("2", b"two", ttl_s=10)
+    await backend.get("1")
+    await backend.set("3", b"three", ttl_s=10)
+
+    assert await backend.get("2") is None
+    assert await backend.get("1") == b"one"
+
+    now[0] = 10
+    assert await backend.get("1") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = VideoCache(LRUCacheBackend(max_entries=10), ttl_s=60)
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return b"video"
+
+    results = await asyncio.gather(*(cache.get_or_load(1, load) for _ in range(5)))
+
+    assert results == [b"video"] * 5
+    assert loads == 1
+    assert await cache.get_or_load(1, load) == b"video"
+    stats = cache.stats()
+    assert (stats.misses, stats.coalesced, stats.hits) == (1, 4, 1)
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_is_not_overwritten():
+    cache = VideoCache(LRUCacheBackend(max_entries=10), ttl_s=60)
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_load():
+        loading.set()
+        await release.wait()
+        return b"old"
+
+    task = asyncio.create_task(cache.get_or_load(1, slow_load))
+    await loading.wait()
+    await cache.invalidate([1])
+    release.set()
+
+    assert await task == b"old"
+    assert await cache.backend.get("1") is None
+
+
+@pytest.mark.asyncio
+async def test_waiters_reload_when_first_caller_is_cancelled():
+    cache = VideoCache(LRUCacheBackend(max_entries=10), ttl_s=60)
+    loading = asyncio.Event()
+
+    async def hanging_load():
+        loading.set()
+        await asyncio.Event().wait()
+
+    async def load():
+        return b"video"
+
+    first = asyncio.create_task(cache.get_or_load(1, hanging_load))
+    await loading.wait()
+    second = asyncio.create_task(cache.get_or_load(1, load))
+    await asyncio.sleep(0)
+    assert cache.stats().coalesced == 1
+
+    first.cancel()
+
+    assert await second == b"video"
+    assert first.cancelled()
+    assert await cache.backend.get("1") == b"video"
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_round_trip():
+    client = FakeRedis()
+    cache = VideoCache(RedisCacheBackend(client, prefix="test:"), ttl_s=1.5)
+
+    async def load():
+        return b"video"
+
+    await cache.get_or_load(7, load)
+    assert client.data == {"test:7": b"video"}
+    assert client.ttls == {"test:7": 1500}
+
+    await cache.invalidate([7])
+    assert client.data == {}
+
+    await cache.get_or_load(8, load)
+    await cache.clear()
+    assert client.data == {}
+
+
+@pytest.mark.asyncio
+async def test_get_video_is_cached_and_invalidated(client: AsyncClient):
+    video_id = await create_video(client)
+    hits = video_cache.stats().hits
+
+    first = await client.get(f"/videos/{video_id}")
+    second = await client.get(f"/videos/{video_id}")
+    assert first.json() == second.json()
+    assert video_cache.stats().hits == hits + 1
+
+    await client.patch(
+        "/videos/status", json={"status": "transcoded", "ids": [video_id]}
+    )
+    assert (await client.get(f"/videos/{video_id}")).json()["status"] == "transcoded"
+
+    await client.patch(f"/videos/{video_id}/status", json={"status": "recognized"})
+    assert (await client.get(f"/videos/{video_id}")).json()["status"] == "recognized"
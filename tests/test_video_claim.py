@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.models import Video
+from .utils import create_videos
+
+
+@pytest.mark.asyncio
+async def test_claims_do_not_overlap(client: AsyncClient):
+    ids = await create_videos(client, 5)
+
+    first = await client.post("/videos/claim", params={"limit": 3, "lease": 60})
+    second = await client.post("/videos/claim", params={"limit": 3, "lease": 60})
+    third = await client.post("/videos/claim", params={"limit": 3})
+
+    assert first.status_code == 200
+    first_ids = [video["id"] for video in first.json()["items"]]
+    second_ids = [video["id"] for video in second.json()["items"]]
+    assert first_ids == ids[:3]
+    assert second_ids == ids[3:]
+    assert third.json()["items"] == []
+    assert first.json()["lease_token"] != second.json()["lease_token"]
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_claimable_again(
+    client: AsyncClient, test_session: AsyncSession
+):
+    (video_id,) = await create_videos(client, 1)
+    claimed = await client.post("/videos/claim", params={"lease": 30})
+    assert [video["id"] for video in claimed.json()["items"]] == [video_id]
+
+    await test_session.execute(
+        update(Video).values(
+            lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+        )
+    )
+    await test_session.commit()
+
+    reclaimed = await client.post("/videos/claim")
+    assert [video["id"] for video in reclaimed.json()["items"]] == [video_id]
+    assert reclaimed.json()["lease_token"] != claimed.json()["lease_token"]
+
+
+@pytest.mark.asyncio
+async def test_status_change_releases_claim(client: AsyncClient):
+    (video_id,) = await create_videos(client, 1)
+    await client.post("/videos/claim")
+
+    await client.patch(f"/videos/{video_id}/status", json={"status": "transcoded"})
+
+    assert (await client.post("/videos/claim")).json()["items"] == []
+    claimed = await client.post("/videos/claim", params={"status": "transcoded"})
+    assert [video["id"] for video in claimed.json()["items"]] == [video_id]
+
+
+@pytest.mark.asyncio
+async def test_claim_rejects_invalid_lease(client: AsyncClient):
+    assert (await client.post("/videos/claim", params={"lease": 0})).status_code == 422
+    too_long = await client.post("/videos/claim", params={"lease": 2 * 86400})
+    assert too_long.status_code == 422
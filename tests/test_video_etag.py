@@ -0,0 +1,81 @@
+import pytest
+from httpx import AsyncClient
+
+from app.services import VideoService
+from app.utils import etag_matches, listing_etag
+from .utils import create_video
+
+
+def test_etag_matching():
+    assert etag_matches('"1-2"', '"1-2"')
+    assert etag_matches('W/"abc", "1-2"', '"1-2"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches("*", '"1-2"')
+    assert not etag_matches('"1-1"', '"1-2"')
+    assert not etag_matches(None, '"1-2"')
+
+
+def test_listing_etag_tells_pages_with_equal_sums_apart():
+    def etag(ids):
+        rows = [{"id": video_id, "version": 1} for video_id in ids]
+        return listing_etag(VideoService.page_validator(rows, None))
+
+    assert etag([5, 4, 1]) != etag([5, 3, 2])
+    assert etag([5, 4, 1]) != etag([5, 1, 4])
+    assert etag([5, 4, 1]) == etag([5, 4, 1])
+
+
+@pytest.mark.asyncio
+async def test_get_video_conditional(client: AsyncClient):
+    video_id = await create_video(client)
+
+    response = await client.get(f"/videos/{video_id}")
+    etag = response.headers["etag"]
+    assert etag == f'"{video_id}-1"'
+    assert response.json()["version"] == 1
+
+    not_modified = await client.get(
+        f"/videos/{video_id}", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    await client.patch(f"/videos/{video_id}/status", json={"status": "transcoded"})
+    changed = await client.get(f"/videos/{video_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] == f'"{video_id}-2"'
+
+
+@pytest.mark.asyncio
+async def test_list_videos_conditional(client: AsyncClient):
+    first = await create_video(client, camera_number=1)
+    await create_video(client, camera_number=2)
+    params = {"limit": 1}
+
+    response = await client.get("/videos", params=params)
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    not_modified = await client.get(
+        "/videos", params=params, headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+
+    other_page = await client.get(
+        "/videos", params={"limit": 2}, headers={"If-None-Match": etag}
+    )
+    assert other_page.status_code == 200
+
+    # The second video is on the page, the first only decides the next cursor.
+    await client.patch("/videos/status", json={"status": "transcoded", "ids": [first]})
+    assert (
+        await client.get("/videos", params=params, headers={"If-None-Match": etag})
+    ).status_code == 304
+
+    await create_video(client, camera_number=3)
+    changed = await client.get(
+        "/videos", params=params, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.routers.api.video import _event_stream
+from app.utils import EventBroker, VideoEvent, event_broker
+
+
+def make_event(camera_number: int, status: str = "new") -> VideoEvent:
+    return VideoEvent(
+        type="created", video={"camera_number": camera_number, "status": status}
+    )
+
+
+def test_broker_filters_by_camera_and_status():
+    broker = EventBroker(max_queue=10)
+    camera = broker.subscribe(camera_numbers=[1])
+    transcoded = broker.subscribe(statuses=["transcoded"])
+
+    broker.publish([make_event(1), make_event(2, "transcoded")])
+
+    assert camera._queue.qsize() == 1
+    assert transcoded._queue.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_broker_drops_subscribers_that_fall_behind():
+    broker = EventBroker(max_queue=2)
+    subscription = broker.subscribe()
+
+    broker.publish([make_event(1), make_event(1), make_event(1)])
+
+    assert broker.subscribers == 0
+    assert await subscription.get() is None
+
+
+@pytest.mark.asyncio
+async def test_api_changes_reach_subscribers(client: AsyncClient):
+    subscription = event_broker.subscribe(camera_numbers=[7])
+    try:
+        payload = {
+            "video_path": "/videos/camera7/clip.mp4",
+            "start_time": "2024-01-01T00:00:00Z",
+            "duration": 60,
+            "camera_number": 7,
+            "location": "Gate A",
+        }
+        video_id = (await client.post("/videos", json=payload)).json()["id"]
+        await client.post("/videos", json={**payload, "camera_number": 8})
+        await client.patch(f"/videos/{video_id}/status", json={"status": "transcoded"})
+
+        created = await asyncio.wait_for(subscription.get(), 1)
+        updated = await asyncio.wait_for(subscription.get(), 1)
+    finally:
+        event_broker.unsubscribe(subscription)
+
+    assert (created.type, created.video["id"]) == ("created", video_id)
+    assert (updated.type, updated.video["status"]) == ("status", "transcoded")
+    assert subscription._queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_event_stream_frames_and_keepalive():
+    broker = EventBroker(max_queue=10)
+    subscription = broker.subscribe()
+    stream = _event_stream(subscription, keepalive_s=0.01)
+
+    assert await anext(stream) == ": keepalive\n\n"
+
+    broker.publish([make_event(3)])
+    frame = await anext(stream)
+    event_line, data_line, _, _ = frame.split("\n")
+    assert event_line == "event: created"
+    assert json.loads(data_line.removeprefix("data: "))["video"]["camera_number"] == 3
+
+    await stream.aclose()
@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from .utils import create_videos
+
+# Two clips from camera 1 and one from camera 2, a day apart.
+VIDEOS = dict(
+    camera_numbers=(1, 1, 2),
+    start_times=[f"2024-01-0{day}T00:00:00Z" for day in (1, 2, 3)],
+    duration=90,
+    location="Gate, A",
+)
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson(client: AsyncClient):
+    await create_videos(client, 3, **VIDEOS)
+
+    response = await client.get("/videos/export", params={"camera_number": [1]})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["video_path"] for row in rows] == [
+        "/videos/camera1/clip1.mp4",
+        "/videos/camera1/clip0.mp4",
+    ]
+    assert rows[0]["duration"] == "PT1M30S"
+    assert rows[0]["status"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_export_csv(client: AsyncClient):
+    await create_videos(client, 3, **VIDEOS)
+
+    response = await client.get("/videos/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert rows[0]["video_path"] == "/videos/camera2/clip2.mp4"
+    assert rows[0]["location"] == "Gate, A"
+    assert float(rows[0]["duration"]) == 90.0
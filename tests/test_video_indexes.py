@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.services import VideoService
+from app.utils import encode_cursor
+from core.models import Video, VideoStatus
+
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+async def explain(session, **filters) -> str:
+    query = VideoService.apply_keyset(
+        VideoService.apply_filters(select(Video), **filters),
+        encode_cursor(SINCE, 10),
+    ).limit(100)
+    connection = await session.connection()
+    sql = query.compile(connection.engine, compile_kwargs={"literal_binds": True})
+    result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+    return "\n".join(row[3] for row in result)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        ({"camera_numbers": [1]}, "ix_videos_camera_number_start_time"),
+        (
+            {"camera_numbers": [1], "start_time_from": SINCE},
+            "ix_videos_camera_number_start_time",
+        ),
+        ({"statuses": [VideoStatus.NEW]}, "ix_videos_status_start_time"),
+        (
+            {"statuses": [VideoStatus.NEW], "start_time_from": SINCE},
+            "ix_videos_status_start_time",
+        ),
+        ({"locations": ["Gate A"]}, "ix_videos_location_start_time"),
+        ({"start_time_from": SINCE}, "ix_videos_start_time"),
+        ({}, "ix_videos_start_time"),
+    ],
+)
+async def test_list_filters_use_indexes(test_session, filters, index):
+    plan = await explain(test_session, **filters)
+
+    assert f"USING INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,73 @@
+import pytest
+from httpx import AsyncClient
+
+from . import utils
+
+
+async def create_video(
+    client: AsyncClient, camera_number: int, start_time: str, duration: int
+) -> int:
+    return await utils.create_video(
+        client,
+        video_path=f"/videos/camera{camera_number}/{start_time}.mp4",
+        start_time=start_time,
+        duration=duration,
+        camera_number=camera_number,
+        location=f"Gate {camera_number}",
+    )
+
+
+@pytest.mark.asyncio
+async def test_stats_by_camera_and_day(client: AsyncClient):
+    await create_video(client, 1, "2024-01-01T08:00:00Z", 60)
+    await create_video(client, 1, "2024-01-01T09:30:00Z", 30)
+    await create_video(client, 1, "2024-01-02T08:00:00Z", 120)
+    await create_video(client, 2, "2024-01-01T10:00:00Z", 15)
+
+    response = await client.get(
+        "/videos/stats", params={"group_by": "camera_number", "bucket": "day"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["group_by"] == ["camera_number"]
+    assert [
+        (item["bucket"], item["camera_number"], item["count"], item["total_duration"])
+        for item in body["items"]
+    ] == [
+        ("2024-01-01T00:00:00Z", 1, 2, "PT1M30S"),
+        ("2024-01-01T00:00:00Z", 2, 1, "PT15S"),
+        ("2024-01-02T00:00:00Z", 1, 1, "PT2M"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stats_totals_and_filters(client: AsyncClient):
+    video_id = await create_video(client, 1, "2024-01-01T08:00:00Z", 60)
+    await create_video(client, 2, "2024-03-05T08:00:00Z", 30)
+    await client.patch(f"/videos/{video_id}/status", json={"status": "transcoded"})
+
+    totals = (await client.get("/videos/stats")).json()["items"]
+    assert totals == [
+        {
+            "bucket": None,
+            "camera_number": None,
+            "location": None,
+            "status": None,
+            "count": 2,
+            "total_duration": "PT1M30S",
+        }
+    ]
+
+    by_status = await client.get(
+        "/videos/stats",
+        params={"group_by": ["status", "location"], "bucket": "month"},
+    )
+    assert [
+        (item["bucket"][:7], item["status"], item["location"])
+        for item in by_status.json()["items"]
+    ] == [("2024-01", "transcoded", "Gate 1"), ("2024-03", "new", "Gate 2")]
+
+    empty = await client.get("/videos/stats", params={"camera_number": 99})
+    assert empty.json()["items"][0]["count"] == 0
+    assert empty.json()["items"][0]["total_duration"] == "PT0S"
@@ -0,0 +1,115 @@
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.services import VideoService
+from core.models import Video, VideoStatus
+from .utils import create_videos
+
+
+@pytest.mark.asyncio
+async def test_bulk_transition_by_ids_skips_stale_rows(client: AsyncClient):
+    first, second, third = await create_videos(client, 3)
+    await client.patch(f"/videos/{third}/status", json={"status": "recognized"})
+
+    response = await client.patch(
+        "/videos/status",
+        json={"status": "transcoded", "ids": [first, second, third, 999]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert sorted(body["updated"]) == [first, second]
+    assert body["skipped"] == [third]
+    assert body["missing"] == [999]
+
+    response = await client.patch(
+        "/videos/status", json={"status": "recognized", "ids": [first, second, third]}
+    )
+    assert sorted(response.json()["updated"]) == [first, second]
+    assert response.json()["skipped"] == [third]
+
+    fetched = await client.get(f"/videos/{first}")
+    assert fetched.json()["status"] == "recognized"
+
+
+@pytest.mark.asyncio
+async def test_bulk_transition_by_filter(client: AsyncClient):
+    first, second = await create_videos(client, 2)
+
+    response = await client.patch(
+        "/videos/status",
+        json={
+            "status": "transcoded",
+            "expected_status": "new",
+            "filter": {"camera_number": [2]},
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["updated"] == [second]
+    assert (await client.get(f"/videos/{first}")).json()["status"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_bulk_transition_rejects_illegal_requests(client: AsyncClient):
+    (video_id,) = await create_videos(client, 1)
+
+    illegal = await client.patch(
+        "/videos/status",
+        json={"status": "recognized", "expected_status": "new", "ids": [video_id]},
+    )
+    assert illegal.status_code == 400
+
+    ambiguous = await client.patch(
+        "/videos/status",
+        json={"status": "transcoded", "ids": [video_id], "filter": {}},
+    )
+    assert ambiguous.status_code == 422
+
+    for empty_filter in ({}, {"camera_number": []}):
+        unbounded = await client.patch(
+            "/videos/status", json={"status": "transcoded", "filter": empty_filter}
+        )
+        assert unbounded.status_code == 422
+    assert (await client.get(f"/videos/{video_id}")).json()["status"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_filter_transition_reports_rows_left_by_the_cap(
+    client: AsyncClient, test_session, monkeypatch
+):
+    ids = await create_videos(client, 6)
+    monkeypatch.setattr("app.services.video.BULK_STATUS_BATCH_SIZE", 2)
+    selection = dict(
+        target=VideoStatus.TRANSCODED, start_time_from=datetime(2000, 1, 1)
+    )
+
+    assert await VideoService.transition_status(
+        test_session, max_rows=3, **selection
+    ) == (ids[:3], True)
+
+    # A row that changes between the scan and its UPDATE is scanned but not
+    # updated; the rows after it are still reported as left.
+    transition_rows = VideoService._transition_rows
+
+    async def racing_transition_rows(session, target, allowed, selection_clause):
+        await session.execute(
+            update(Video)
+            .where(Video.id == ids[3])
+            .values(status=VideoStatus.RECOGNIZED)
+        )
+        return await transition_rows(session, target, allowed, selection_clause)
+
+    monkeypatch.setattr(VideoService, "_transition_rows", racing_transition_rows)
+    assert await VideoService.transition_status(
+        test_session, max_rows=2, **selection
+    ) == ([ids[4]], True)
+    monkeypatch.setattr(VideoService, "_transition_rows", transition_rows)
+
+    # Exactly max_rows rows left: the cap is reached, but nothing remains.
+    assert await VideoService.transition_status(
+        test_session, max_rows=1, **selection
+    ) == ([ids[5]], False)
@@ -0,0 +1,106 @@
+import pytest
+from httpx import AsyncClient
+
+CLIPS = [
+    (7, "2024-01-01T13:50:00Z", 20 * 60),
+    (7, "2024-01-01T14:05:00Z", 15 * 60),
+    (7, "2024-01-01T14:30:00Z", 10 * 60),
+    (7, "2024-01-01T14:40:00Z", 10 * 60),
+    (7, "2024-01-01T15:10:00Z", 10 * 60),
+    (8, "2024-01-01T14:00:00Z", 60 * 60),
+]
+
+
+def interval(start: str, end: str) -> dict:
+    return {"start": f"2024-01-01T{start}:00Z", "end": f"2024-01-01T{end}:00Z"}
+
+
+@pytest.mark.asyncio
+async def test_timeline_merges_clips_and_reports_gaps(client: AsyncClient):
+    for idx, (camera_number, start_time, duration) in enumerate(CLIPS):
+        payload = {
+            "video_path": f"/videos/camera{camera_number}/clip{idx}.mp4",
+            "start_time": start_time,
+            "duration": duration,
+            "camera_number": camera_number,
+            "location": "Gate A",
+        }
+        assert (await client.post("/videos", json=payload)).status_code == 201
+
+    response = await client.get(
+        "/videos/timeline",
+        params={
+            "camera_number": 7,
+            "from": "2024-01-01T14:00:00Z",
+            "to": "2024-01-01T15:00:00Z",
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["covered"] == [interval("14:00", "14:20"), interval("14:30", "14:50")]
+    assert body["gaps"] == [interval("14:20", "14:30"), interval("14:50", "15:00")]
+    assert body["overlaps"] == [interval("14:05", "14:10")]
+
+
+@pytest.mark.asyncio
+async def test_timeline_without_clips_is_one_gap(client: AsyncClient):
+    params = {
+        "camera_number": 3,
+        "from": "2024-01-01T14:00:00Z",
+        "to": "2024-01-01T15:00:00Z",
+    }
+    response = await client.get("/videos/timeline", params=params)
+
+    assert response.status_code == 200
+    assert response.json()["gaps"] == [interval("14:00", "15:00")]
+
+    params["to"] = params["from"]
+    response = await client.get("/videos/timeline", params=params)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_timeline_reports_the_requested_span_in_utc(client: AsyncClient):
+    params = {
+        "camera_number": 3,
+        "from": "2024-01-01T14:00:00",
+        "to": "2024-01-01T18:00:00+03:00",
+    }
+    response = await client.get("/videos/timeline", params=params)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["start"], body["end"]) == (
+        "2024-01-01T14:00:00Z",
+        "2024-01-01T15:00:00Z",
+    )
+    assert body["gaps"] == [interval("14:00", "15:00")]
+
+
+@pytest.mark.asyncio
+async def test_find_videos_at_returns_clips_containing_instant(client: AsyncClient):
+    for idx, (camera_number, start_time, duration) in enumerate(CLIPS):
+        payload = {
+            "video_path": f"/videos/camera{camera_number}/clip{idx}.mp4",
+            "start_time": start_time,
+            "duration": duration,
+            "camera_number": camera_number,
+            "location": "Gate A",
+        }
+        assert (await client.post("/videos", json=payload)).status_code == 201
+
+    async def paths_at(ts: str, camera_number: int = 7) -> list[str]:
+        response = await client.get(
+            "/videos/at", params={"camera_number": camera_number, "ts": ts}
+        )
+        assert response.status_code == 200
+        return [video["video_path"] for video in response.json()]
+
+    assert await paths_at("2024-01-01T14:07:00Z") == [
+        "/videos/camera7/clip1.mp4",
+        "/videos/camera7/clip0.mp4",
+    ]
+    assert await paths_at("2024-01-01T14:40:00Z") == ["/videos/camera7/clip3.mp4"]
+    assert await paths_at("2024-01-01T14:25:00Z") == []
+    assert await paths_at("2024-01-01T14:25:00Z", camera_number=9) == []
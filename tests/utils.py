@@ -1,3 +1,7 @@
+from collections.abc import Sequence
+from typing import Any
+
+from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.app import app
@@ -15,3 +19,52 @@ def override_db_session(session: AsyncSession) -> None:
 
     app.dependency_overrides[db_helper.get_scoped_session] = override_get_scoped_session
     app.dependency_overrides[db_helper.session_dependency] = override_session_dependency
+    app.dependency_overrides[db_helper.read_session_dependency] = (
+        override_session_dependency
+    )
+
+
+async def create_video(client: AsyncClient, **fields: Any) -> int:
+    """Create a video through the API and return its id"""
+
+    camera_number = fields.get("camera_number", 1)
+    payload = {
+        "video_path": f"/videos/camera{camera_number}/clip.mp4",
+        "start_time": "2024-01-01T00:00:00Z",
+        "duration": 60,
+        "camera_number": camera_number,
+        "location": "Gate A",
+        **fields,
+    }
+    response = await client.post("/videos", json=payload)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def create_videos(
+    client: AsyncClient,
+    count: int,
+    camera_numbers: Sequence[int] | None = None,
+    start_times: Sequence[str] | None = None,
+    **fields: Any,
+) -> list[int]:
+    """
+    Create count videos through the API and return their ids
+
+    Video i is on camera_numbers[i] (camera i + 1 by default), starts at
+    start_times[i] if given, and takes the other fields from create_video.
+    """
+
+    camera_numbers = camera_numbers or range(1, count + 1)
+    ids = []
+    for idx in range(count):
+        camera_number = camera_numbers[idx]
+        video = {
+            "video_path": f"/videos/camera{camera_number}/clip{idx}.mp4",
+            "camera_number": camera_number,
+            **fields,
+        }
+        if start_times is not None:
+            video["start_time"] = start_times[idx]
+        ids.append(await create_video(client, **video))
+    return ids